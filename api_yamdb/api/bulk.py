@@ -0,0 +1,285 @@
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from reviews.leaderboards import (refresh_leaderboards,
+                                  schedule_leaderboard_refresh)
+from reviews.models import Category, Genre, Review, Title
+from reviews.ratings import update_title_rating
+from reviews.search import index_titles
+from users.models import User
+from .cache import invalidate
+from .serializers import ReviewImportItemSerializer, TitleBulkItemSerializer
+
+TITLE_FIELDS = ('name', 'year', 'description', 'category')
+
+REVIEW_IMPORT_BATCH_SIZE = 500
+
+REVIEW_CONFLICT = {
+    'status': 'conflict',
+    'errors': {
+        'non_field_errors': ['Можно оставить только 1 отзыв на произведение.']
+    },
+}
+
+
+def bulk_create_with_ids(model, objects):
+    """bulk_create, после которого у объектов заполнены pk.
+
+    Если БД не возвращает pk из INSERT (SQLite), они читаются заново:
+    внутри транзакции после вставки блокировка на запись удерживается
+    до коммита, поэтому последние len(objects) id принадлежат нам.
+    """
+    model.objects.bulk_create(objects)
+    if not objects or objects[0].pk is not None:
+        return objects
+    ids = model.objects.order_by('-pk').values_list(
+        'pk', flat=True
+    )[:len(objects)]
+    for obj, pk in zip(objects, reversed(list(ids))):
+        obj.pk = pk
+    return objects
+
+
+def related_errors(data, titles, categories, genres):
+    """Ошибки ссылок элемента на несуществующие объекты."""
+    errors = {}
+    if 'id' in data and data['id'] not in titles:
+        errors['id'] = ['Произведение не найдено.']
+    if data.get('category') and data['category'] not in categories:
+        errors['category'] = [f'Категория {data["category"]} не найдена.']
+    unknown = [slug for slug in data.get('genre', ()) if slug not in genres]
+    if unknown:
+        errors['genre'] = [f'Жанр {slug} не найден.' for slug in unknown]
+    return errors
+
+
+def build_title(data, titles, categories):
+    """Новое или существующее произведение с полями элемента."""
+    title = titles[data['id']] if 'id' in data else Title()
+    for field in TITLE_FIELDS:
+        if field not in data:
+            continue
+        value = data[field]
+        if field == 'category':
+            value = categories[value] if value else None
+        setattr(title, field, value)
+    return title
+
+
+def write_titles(created, updated, links):
+    """Записывает произведения и их жанры пачками в одной транзакции.
+
+    created, updated и links — словари по индексу элемента запроса.
+    """
+    existing = {title.pk for title in updated.values()}
+    with transaction.atomic():
+        bulk_create_with_ids(Title, list(created.values()))
+        if updated:
+            Title.objects.bulk_update(
+                list({title.pk: title for title in updated.values()}.values()),
+                TITLE_FIELDS + ('modified',),
+            )
+        relinked = [
+            (created.get(index) or updated[index]).pk for index in links
+        ]
+        Title.genre.through.objects.filter(title_id__in=[
+            pk for pk in relinked if pk in existing
+        ]).delete()
+        Title.genre.through.objects.bulk_create(list({
+            (title_pk, genre.pk): Title.genre.through(
+                title_id=title_pk, genre_id=genre.pk
+            )
+            for title_pk, index in zip(relinked, links)
+            for genre in links[index]
+        }.values()))
+        index_titles(list(created.values()) + list(updated.values()))
+        for title in updated.values():
+            schedule_leaderboard_refresh(title.pk)
+        transaction.on_commit(lambda: invalidate('titles'))
+
+
+def bulk_save_titles(items):
+    """Создаёт и обновляет произведения одним проходом.
+
+    Элементы с id обновляют существующие произведения, без id — создают
+    новые. Категории, жанры и изменяемые произведения загружаются одним
+    запросом на модель, запись идёт пачками в одной транзакции.
+    Возвращает результаты в порядке элементов: id и статус или ошибки
+    элемента.
+    """
+    results = [None] * len(items)
+    valid = {}
+    for index, item in enumerate(items):
+        serializer = TitleBulkItemSerializer(data=item)
+        if serializer.is_valid():
+            valid[index] = serializer.validated_data
+        else:
+            results[index] = {'errors': serializer.errors}
+
+    title_ids = {data['id'] for data in valid.values() if 'id' in data}
+    titles = Title.objects.in_bulk(title_ids)
+    categories = Category.objects.in_bulk({
+        data['category'] for data in valid.values() if data.get('category')
+    }, field_name='slug')
+    genres = Genre.objects.in_bulk({
+        slug for data in valid.values() for slug in data.get('genre', ())
+    }, field_name='slug')
+
+    now = timezone.now()
+    created, updated, links = {}, {}, {}
+    for index, data in valid.items():
+        errors = related_errors(data, titles, categories, genres)
+        if errors:
+            results[index] = {'errors': errors}
+            continue
+        title = build_title(data, titles, categories)
+        title.modified = now
+        if 'id' in data:
+            updated[index] = title
+        else:
+            created[index] = title
+        if 'genre' in data:
+            links[index] = [genres[slug] for slug in data['genre']]
+
+    write_titles(created, updated, links)
+
+    for index, title in created.items():
+        results[index] = {'id': title.pk, 'status': 'created'}
+    for index, title in updated.items():
+        results[index] = {'id': title.pk, 'status': 'updated'}
+    return results
+
+
+def review_targets(valid):
+    """Произведения, авторы и существующие пары (произведение, автор)."""
+    titles = Title.objects.in_bulk({
+        data['title_id'] for data in valid.values()
+    })
+    authors = User.objects.filter(pending_deletion=False).in_bulk({
+        data['author'] for data in valid.values()
+    }, field_name='username')
+    existing = set(Review.objects.filter(
+        title_id__in=titles,
+        author_id__in=[author.pk for author in authors.values()],
+    ).values_list('title_id', 'author_id'))
+    return titles, authors, existing
+
+
+def build_review(data, titles, authors, existing):
+    """Отзыв элемента импорта или результат с ошибками элемента.
+
+    existing пополняется, поэтому повтор внутри импорта тоже считается
+    конфликтом.
+    """
+    errors = {}
+    if data['title_id'] not in titles:
+        errors['title_id'] = ['Произведение не найдено.']
+    author = authors.get(data['author'])
+    if author is None:
+        errors['author'] = [f'Пользователь {data["author"]} не найден.']
+    if errors:
+        return None, {'errors': errors}
+    if (data['title_id'], author.pk) in existing:
+        return None, REVIEW_CONFLICT
+    existing.add((data['title_id'], author.pk))
+    return Review(
+        title_id=data['title_id'],
+        author=author,
+        text=data['text'],
+        score=data['score'],
+        pub_date=data.get('pub_date'),
+    ), None
+
+
+def create_reviews(reviews, pub_dates):
+    """Вставляет отзывы и записывает им даты публикации из импорта.
+
+    auto_now_add заменяет pub_date объекта при вставке, поэтому даты
+    передаются отдельно и записываются следом одним bulk_update.
+    """
+    bulk_create_with_ids(Review, reviews)
+    dated = []
+    for review, pub_date in zip(reviews, pub_dates):
+        if pub_date is not None:
+            review.pub_date = pub_date
+            dated.append(review)
+    Review.objects.bulk_update(dated, ('pub_date',))
+
+
+def insert_reviews(reviews):
+    """Вставляет пачку отзывов в одной транзакции.
+
+    Если отзыв того же автора появился после проверки, пачка
+    вставляется заново по одному отзыву; отзывы, нарушающие
+    title_author, остаются без pk. Даты из импорта запоминаются до
+    первой попытки: неудачная вставка уже заменила их в объектах.
+    """
+    pub_dates = [review.pub_date for review in reviews]
+    try:
+        with transaction.atomic():
+            create_reviews(reviews, pub_dates)
+        return
+    except IntegrityError:
+        pass
+    for review, pub_date in zip(reviews, pub_dates):
+        review.pk = None
+        try:
+            with transaction.atomic():
+                create_reviews([review], [pub_date])
+        except IntegrityError:
+            review.pk = None
+            review.pub_date = pub_date
+
+
+def update_imported_titles(reviews):
+    """Обновляет агрегаты, рейтинги и кэш один раз на произведение."""
+    scores = defaultdict(list)
+    for review in reviews:
+        scores[review.title_id].append(review.score)
+    with transaction.atomic():
+        for title_id, added in scores.items():
+            update_title_rating(title_id, added=added)
+        refresh_leaderboards(list(scores))
+    invalidate('titles')
+
+
+def bulk_import_reviews(items, batch_size=REVIEW_IMPORT_BATCH_SIZE):
+    """Импортирует отзывы пачками по batch_size в отдельных транзакциях.
+
+    Сигналы отзывов не отправляются: агрегаты произведений обновляются
+    в конце, по одному UPDATE на произведение. Возвращает результаты в
+    порядке элементов: id и статус, конфликт или ошибки элемента.
+    """
+    results = [None] * len(items)
+    valid = {}
+    for index, item in enumerate(items):
+        serializer = ReviewImportItemSerializer(data=item)
+        if serializer.is_valid():
+            valid[index] = serializer.validated_data
+        else:
+            results[index] = {'errors': serializer.errors}
+
+    titles, authors, existing = review_targets(valid)
+    reviews = {}
+    for index, data in valid.items():
+        review, result = build_review(data, titles, authors, existing)
+        if review is None:
+            results[index] = result
+        else:
+            reviews[index] = review
+
+    pending = list(reviews.values())
+    for start in range(0, len(pending), batch_size):
+        insert_reviews(pending[start:start + batch_size])
+
+    for index, review in reviews.items():
+        results[index] = (
+            REVIEW_CONFLICT if review.pk is None
+            else {'id': review.pk, 'status': 'created'}
+        )
+    update_imported_titles(
+        review for review in pending if review.pk is not None
+    )
+    return results
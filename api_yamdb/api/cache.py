@@ -0,0 +1,115 @@
+import hashlib
+from urllib.parse import urlencode
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+from .replicas import is_sticky, read_alias
+
+CACHE_PREFIX = 'catalog'
+HITS_KEY = f'{CACHE_PREFIX}:stats:hits'
+MISSES_KEY = f'{CACHE_PREFIX}:stats:misses'
+
+
+def get_cache():
+    return caches[settings.CATALOG_CACHE_ALIAS]
+
+
+def version_key(namespace):
+    return f'{CACHE_PREFIX}:{namespace}:version'
+
+
+def get_version(namespace):
+    """Случайная версия: после вытеснения ключа старые записи не вернутся."""
+    cache = get_cache()
+    key = version_key(namespace)
+    cache.add(key, uuid4().hex, None)
+    version = cache.get(key)
+    if version is None:
+        version = uuid4().hex
+        cache.set(key, version, None)
+    return version
+
+
+def invalidate(*namespaces):
+    """Меняет версию пространств имён, делая их записи недоступными."""
+    get_cache().set_many(
+        {version_key(namespace): uuid4().hex for namespace in namespaces},
+        None
+    )
+
+
+def count(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def cache_stats():
+    cache = get_cache()
+    return {
+        'hits': cache.get(HITS_KEY, 0),
+        'misses': cache.get(MISSES_KEY, 0),
+    }
+
+
+def request_key(namespace, request):
+    """Ключ ответа: версия, БД чтения, адрес и нормализованная строка запроса.
+
+    Ответы реплик хранятся отдельно от ответов основной БД: реплика может
+    вернуть данные до записи, уже сдвинувшей версию.
+    """
+    query = urlencode(sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        for value in values
+    ))
+    digest = hashlib.md5(
+        f'{request.get_host()}{request.path}?{query}'.encode('utf-8')
+    ).hexdigest()
+    alias = read_alias.get() or 'default'
+    version = get_version(namespace)
+    return f'{CACHE_PREFIX}:{namespace}:{version}:{alias}:{digest}'
+
+
+def response_timeout():
+    """Ответ реплики хранится не дольше окна, в котором она может отставать."""
+    if read_alias.get() is None:
+        return settings.CATALOG_CACHE_TIMEOUT
+    return min(settings.CATALOG_CACHE_TIMEOUT, settings.REPLICA_STICKY_SECONDS)
+
+
+class CatalogCacheMixin:
+    """Кэширует данные ответов list в пространстве cache_namespace.
+
+    Ответы каталога не зависят от пользователя, поэтому кэш общий.
+    Другие действия кэшируются вызовом cached() из view. Пользователь,
+    читающий из основной БД после записи, кэш не использует.
+    """
+    cache_namespace = None
+
+    def list(self, request, *args, **kwargs):
+        return self.cached(super().list, request, *args, **kwargs)
+
+    def cached(self, handler, request, *args, **kwargs):
+        if settings.READ_REPLICAS and is_sticky(request):
+            return handler(request, *args, **kwargs)
+        cache = get_cache()
+        key = request_key(self.cache_namespace, request)
+        data = cache.get(key)
+        if data is not None:
+            count(HITS_KEY)
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        count(MISSES_KEY)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, response_timeout())
+        response['X-Cache'] = 'MISS'
+        return response
@@ -0,0 +1,65 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+
+from reviews.models import Review, Title
+
+
+def conditional(request, modified, handler, *args, **kwargs):
+    """Отвечает 304, если у клиента актуальная версия, иначе вызывает handler.
+
+    ETag строится из адреса, строки запроса, Accept и даты изменения
+    объекта, поэтому для проверки не нужна сериализация.
+    """
+    if modified is None:
+        return handler(request, *args, **kwargs)
+    etag = quote_etag(hashlib.md5('|'.join((
+        request.get_full_path(),
+        request.META.get('HTTP_ACCEPT', ''),
+        modified.isoformat(),
+    )).encode('utf-8')).hexdigest())
+    last_modified = int(modified.timestamp())
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        response = handler(request, *args, **kwargs)
+        if response.status_code != status.HTTP_200_OK:
+            return response
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def title_modified(title_id):
+    return Title.objects.filter(pk=title_id).values_list(
+        'modified', flat=True
+    ).first()
+
+
+def review_modified(title_id, review_id):
+    return Review.objects.filter(pk=review_id, title_id=title_id).values_list(
+        'modified', flat=True
+    ).first()
+
+
+class ConditionalGetMixin:
+    """Поддержка ETag/Last-Modified для list и retrieve.
+
+    View возвращает дату изменения из get_modified().
+    """
+
+    def get_modified(self):
+        return None
+
+    def list(self, request, *args, **kwargs):
+        return conditional(
+            request, self.get_modified(), super().list, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return conditional(
+            request, self.get_modified(), super().retrieve, *args, **kwargs
+        )
@@ -0,0 +1,103 @@
+import csv
+import json
+from datetime import date, datetime
+from itertools import islice
+
+from rest_framework import serializers
+
+from reviews.management.commands.load_csv import CSV_FILES
+from .rows import TitleRowSerializer
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Столбцы выгрузок в порядке заголовков файлов static/data.
+CSV_COLUMNS = {
+    'users.csv': (
+        'id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name'
+    ),
+    'category.csv': ('id', 'name', 'slug'),
+    'genre.csv': ('id', 'name', 'slug'),
+    'titles.csv': ('id', 'name', 'year', 'category'),
+    'genre_title.csv': ('id', 'title_id', 'genre_id'),
+    'review.csv': ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+    'comments.csv': ('id', 'review_id', 'text', 'author', 'pub_date'),
+}
+
+# Имя выгрузки: модель, столбцы файла и поля values_list() для них.
+DATASETS = {
+    filename[:-len('.csv')]: (model, CSV_COLUMNS[filename], [
+        renames.get(column, column) for column in CSV_COLUMNS[filename]
+    ])
+    for filename, model, renames in CSV_FILES
+}
+
+datetime_field = serializers.DateTimeField()
+
+
+def export_value(value):
+    """Значение столбца в формате API: даты в ISO 8601, время в UTC с Z."""
+    if isinstance(value, datetime):
+        return datetime_field.to_representation(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def dataset_rows(dataset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Кортежи значений выгрузки по порядку id, читаемые пачками."""
+    model, _, fields = DATASETS[dataset]
+    return model.objects.order_by('pk').values_list(*fields).iterator(
+        chunk_size=chunk_size
+    )
+
+
+class Echo:
+    """Буфер для csv.writer, возвращающий записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(dataset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Строки CSV с заголовком как в static/data для загрузки load_csv."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(DATASETS[dataset][1])
+    for row in dataset_rows(dataset, chunk_size):
+        yield writer.writerow([
+            '' if value is None else export_value(value) for value in row
+        ])
+
+
+def ndjson_lines(dataset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Строки NDJSON: объект на строку с теми же столбцами, что в CSV.
+
+    Произведения выгружаются в формате API вместе с рейтингом, жанрами
+    и категорией.
+    """
+    if dataset == 'titles':
+        yield from title_lines(chunk_size)
+        return
+    columns = DATASETS[dataset][1]
+    for row in dataset_rows(dataset, chunk_size):
+        yield json.dumps(
+            dict(zip(columns, map(export_value, row))), ensure_ascii=False
+        ) + '\n'
+
+
+def title_lines(chunk_size):
+    serializer = TitleRowSerializer()
+    rows = DATASETS['titles'][0].objects.order_by('pk').values(
+        *serializer.columns
+    ).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        for title in serializer.serialize(chunk):
+            yield json.dumps(title, ensure_ascii=False) + '\n'
+
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', csv_lines),
+    'ndjson': ('application/x-ndjson; charset=utf-8', ndjson_lines),
+}
@@ -0,0 +1,70 @@
+from collections import OrderedDict
+
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def requested_fields(request, available):
+    """Поля из ?fields= и ?omit= в порядке available или None без параметров.
+
+    Неизвестные имена полей игнорируются.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    fields = request.query_params.get(FIELDS_PARAM)
+    omit = request.query_params.get(OMIT_PARAM)
+    if not fields and not omit:
+        return None
+    selected = list(available)
+    if fields:
+        wanted = set(fields.split(','))
+        selected = [name for name in selected if name in wanted]
+    if omit:
+        unwanted = set(omit.split(','))
+        selected = [name for name in selected if name not in unwanted]
+    return selected
+
+
+class SparseFieldsetSerializerMixin:
+    """Оставляет в сериализаторе только запрошенные в ?fields=/?omit= поля."""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected = requested_fields(self.context.get('request'), fields)
+        if selected is None:
+            return fields
+        return OrderedDict((name, fields[name]) for name in selected)
+
+
+class SparseFieldsetMixin:
+    """Загружает из БД только столбцы запрошенных полей.
+
+    sparse_fields сопоставляет поле сериализатора и поля модели для
+    only(), sparse_select и sparse_prefetch — поле сериализатора и
+    связь, которая нужна только ему.
+    """
+    sparse_fields = {}
+    sparse_select = {}
+    sparse_prefetch = {}
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        selected = requested_fields(self.request, self.sparse_fields)
+        if selected is None:
+            return queryset
+        columns = ['pk']
+        for name in selected:
+            columns.extend(self.sparse_fields[name])
+        queryset = queryset.select_related(None).prefetch_related(None)
+        select = [relation for name, relation in self.sparse_select.items()
+                  if name in selected]
+        if select:
+            queryset = queryset.select_related(*select)
+        prefetch = [relation
+                    for name, relation in self.sparse_prefetch.items()
+                    if name in selected]
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset.only(*columns)
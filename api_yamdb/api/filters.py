@@ -1,6 +1,10 @@
+from django.db.models import CharField, Count, F, Value
+from django.db.models.functions import Cast
 from django_filters import rest_framework as filters
+from rest_framework.filters import BaseFilterBackend
 
 from reviews.models import Title
+from reviews.search import search_titles
 
 
 class TitleFilter(filters.FilterSet):
@@ -12,11 +16,55 @@ class TitleFilter(filters.FilterSet):
         field_name='genre__slug',
         lookup_expr='icontains'
     )
-    category = filters.CharFilter(
-        field_name='category__slug',
-        lookup_expr='icontains'
-    )
+    category = filters.CharFilter(method='filter_category')
 
     class Meta:
         model = Title
         fields = ['name', 'year', 'genre', 'category']
+
+    def filter_category(self, queryset, name, value):
+        """Фильтр по slug категории без категорий, ожидающих удаления."""
+        return queryset.filter(
+            category__slug__icontains=value,
+            category__pending_deletion=False
+        )
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск по названию и описанию с ранжированием."""
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '').strip()
+        if not text:
+            return queryset
+        return search_titles(queryset, text)
+
+
+def title_facets(queryset):
+    """Количество произведений по жанрам, категориям и годам.
+
+    Три группировки объединяются через UNION ALL в один SQL-запрос.
+    Категории, ожидающие удаления, не учитываются.
+    """
+    title_ids = queryset.order_by().values('pk')
+    through = Title.genre.through.objects.filter(title_id__in=title_ids)
+    titles = Title.objects.filter(pk__in=title_ids).order_by()
+    categorized = titles.filter(category__pending_deletion=False)
+    groups = (
+        ('genre', through, F('genre__slug'), 'title_id'),
+        ('category', categorized, F('category__slug'), 'pk'),
+        ('year', titles, Cast('year', CharField()), 'pk'),
+    )
+    parts = [
+        source.order_by().values(key=key).annotate(
+            facet=Value(facet, CharField()),
+            count=Count(counted, distinct=True),
+        ).values_list('facet', 'key', 'count')
+        for facet, source, key, counted in groups
+    ]
+    facets = {facet: {} for facet, *_ in groups}
+    for facet, key, count in parts[0].union(*parts[1:], all=True):
+        if key is not None:
+            facets[facet][key] = count
+    return facets
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.serializers import TitleSerializer
+from reviews.models import Title
+from .benchmark_serializers import best_time
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает JSONRenderer, ORJSONRenderer и MessagePackRenderer '
+        'на ответах TitleSerializer'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=100,
+            help='Количество произведений в ответе',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Количество повторов, берётся лучшее время',
+        )
+
+    def handle(self, *args, **options):
+        titles = Title.objects.select_related('category').prefetch_related(
+            'genre'
+        ).order_by('pk')[:options['limit']]
+        data = TitleSerializer(titles, many=True).data
+        candidates = [
+            ('json', JSONRenderer()),
+            ('orjson', renderers.ORJSONRenderer()),
+        ]
+        if renderers.orjson is None:
+            self.stdout.write('orjson не установлен, ORJSONRenderer = json')
+        if renderers.msgpack is not None:
+            candidates.append(('msgpack', renderers.MessagePackRenderer()))
+        else:
+            self.stdout.write('msgpack не установлен, пропущен')
+        baseline = None
+        for name, renderer in candidates:
+            content = renderer.render(data)
+            timing = best_time(
+                lambda: renderer.render(data), options['repeat']
+            )
+            baseline = baseline or timing
+            self.stdout.write(
+                f'{name}: {len(data)} произведений, {len(content)} байт, '
+                f'{timing * 1000:.3f} мс, '
+                f'ускорение x{baseline / max(timing, 1e-9):.1f}'
+            )
+        if candidates[0][1].render(data) != candidates[1][1].render(data):
+            self.stderr.write('json и orjson: ответы различаются')
+        self.stdout.write(self.style.SUCCESS('Готово'))
@@ -0,0 +1,84 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from api.rows import (CommentRowSerializer, ReviewRowSerializer,
+                      TitleRowSerializer)
+from api.serializers import (CommentSerializer, ReviewSerializer,
+                             TitleSerializer)
+from reviews.models import Comment, Review, Title
+
+BENCHMARKS = (
+    (
+        'titles',
+        Title.objects.select_related('category').prefetch_related('genre'),
+        TitleSerializer,
+        TitleRowSerializer,
+    ),
+    ('reviews', Review.objects.all(), ReviewSerializer, ReviewRowSerializer),
+    (
+        'comments',
+        Comment.objects.all(),
+        CommentSerializer,
+        CommentRowSerializer,
+    ),
+)
+
+
+def best_time(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = perf_counter()
+        function()
+        timings.append(perf_counter() - started)
+    return min(timings)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает сериализаторы DRF и построение ответа из .values() '
+        'на страницах списков'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=100,
+            help='Количество объектов на странице',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Количество повторов, берётся лучшее время',
+        )
+
+    def handle(self, *args, **options):
+        limit = options['limit']
+        repeat = options['repeat']
+        for name, queryset, serializer_class, row_class in BENCHMARKS:
+            queryset = queryset.order_by('-pk')[:limit]
+            row_serializer = row_class()
+
+            def drf():
+                return serializer_class(queryset.all(), many=True).data
+
+            def rows():
+                return row_serializer.serialize(
+                    queryset.prefetch_related(None).values(
+                        *row_serializer.columns
+                    )
+                )
+
+            if drf() != rows():
+                self.stderr.write(f'{name}: ответы различаются')
+            drf_time = best_time(drf, repeat)
+            rows_time = best_time(rows, repeat)
+            self.stdout.write(
+                f'{name}: {len(rows())} объектов, '
+                f'DRF {drf_time * 1000:.2f} мс, '
+                f'values() {rows_time * 1000:.2f} мс, '
+                f'ускорение x{drf_time / max(rows_time, 1e-9):.1f}'
+            )
+        self.stdout.write(self.style.SUCCESS('Готово'))
@@ -1,4 +1,8 @@
-from rest_framework import mixins, viewsets
+from rest_framework import mixins, status, viewsets
+from rest_framework.response import Response
+
+from reviews.deletions import schedule_deletion
+from .serializers import DeletionJobSerializer
 
 
 class ListCreateDestroyViewset(
@@ -20,3 +24,27 @@ class ListCreateRetrieveViewset(
 ):
     """View-класс для операций с данными"""
     pass
+
+
+TRUE_VALUES = ('true', '1', 'yes')
+
+
+def query_flag(request, name):
+    """Включён ли параметр запроса ?name=true."""
+    return request.query_params.get(name, '').lower() in TRUE_VALUES
+
+
+class BackgroundDestroyMixin:
+    """DELETE с ?async=true скрывает объект и удаляет его в фоне.
+
+    Ответ 202 содержит задание удаления, прогресс которого доступен
+    администратору в /api/v1/deletions/.
+    """
+
+    def destroy(self, request, *args, **kwargs):
+        if not query_flag(request, 'async'):
+            return super().destroy(request, *args, **kwargs)
+        job = schedule_deletion(self.get_object())
+        return Response(
+            DeletionJobSerializer(job).data, status=status.HTTP_202_ACCEPTED
+        )
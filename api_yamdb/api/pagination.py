@@ -0,0 +1,145 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (LimitOffsetPagination,
+                                       PageNumberPagination)
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+DEFAULT_CURSOR_ORDERING = ('id',)
+
+
+class KeysetCursorMixin:
+    """Включаемая параметром `?cursor=` keyset-пагинация.
+
+    Порядок берётся из `cursor_ordering` view и должен заканчиваться
+    уникальным полем (`id`), чтобы позиция курсора была однозначной.
+    Без параметра `cursor` работает исходная пагинация с прежним
+    форматом ответа.
+    """
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Неверный курсор.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            self.cursor_mode = False
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor_mode = True
+        self.request = request
+        self.ordering = getattr(
+            view, 'cursor_ordering', DEFAULT_CURSOR_ORDERING
+        )
+        position, reverse = self.decode_cursor(request, queryset.model)
+        page_size = self.get_cursor_page_size(request)
+
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(self.invert(field) for field in ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.after(ordering, position))
+        results = list(queryset[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if not self.cursor_mode:
+            return super().get_next_link()
+        if not self.has_next or not self.page:
+            return None
+        return self.cursor_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.cursor_mode:
+            return super().get_previous_link()
+        if not self.has_previous or not self.page:
+            return None
+        return self.cursor_link(self.page[0], reverse=True)
+
+    def get_cursor_page_size(self, request):
+        return api_settings.PAGE_SIZE
+
+    @staticmethod
+    def invert(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def after(ordering, position):
+        """Условие «строго после позиции» для составного порядка."""
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            values = cursor['p']
+            if len(values) != len(self.ordering):
+                raise ValueError
+            position = [
+                model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, KeyError, UnicodeError,
+                ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, bool(cursor.get('r'))
+
+    def cursor_link(self, obj, reverse):
+        if isinstance(obj, dict):
+            position = [obj[field.lstrip('-')] for field in self.ordering]
+        else:
+            position = [
+                getattr(obj, field.lstrip('-')) for field in self.ordering
+            ]
+        cursor = json.dumps({'p': position, 'r': int(reverse)}, default=str)
+        url = self.request.build_absolute_uri()
+        for param in self.paging_query_params:
+            url = remove_query_param(url, param)
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            urlsafe_b64encode(cursor.encode('utf-8')).decode('ascii'),
+        )
+
+
+class CursorPageNumberPagination(KeysetCursorMixin, PageNumberPagination):
+    paging_query_params = ('page',)
+
+
+class CursorLimitOffsetPagination(KeysetCursorMixin, LimitOffsetPagination):
+    paging_query_params = ('offset',)
+
+    def get_cursor_page_size(self, request):
+        return self.get_limit(request)
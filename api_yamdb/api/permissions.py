@@ -38,3 +38,12 @@ class IsAdminorReadOnly(permissions.BasePermission):
             request.user.is_authenticated
             and (request.user.is_admin or request.user.is_superuser)
         )
+
+
+class IsAdmin(permissions.BasePermission):
+    """Проверка на доступ к служебным операциям только для администратора"""
+
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and (
+            request.user.is_admin or request.user.is_superuser
+        )
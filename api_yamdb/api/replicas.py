@@ -0,0 +1,83 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+# Реплика, из которой читает текущий запрос, или None для основной БД.
+read_alias = ContextVar('read_alias', default=None)
+
+STICKY_COOKIE = 'replica_sticky'
+STICKY_SALT = 'api.replicas.sticky'
+
+
+def stick_to_primary(response, user):
+    """Пользователь читает из основной БД, пока реплики могут отставать.
+
+    Время записи хранится в подписанной cookie, которую клиент
+    возвращает с запросами, поэтому окно видно всем процессам.
+    """
+    response.set_signed_cookie(
+        STICKY_COOKIE, user.pk, salt=STICKY_SALT,
+        max_age=settings.REPLICA_STICKY_SECONDS, httponly=True
+    )
+
+
+def is_sticky(request):
+    if not request.user.is_authenticated:
+        return False
+    user_pk = request.get_signed_cookie(
+        STICKY_COOKIE, default=None, salt=STICKY_SALT,
+        max_age=settings.REPLICA_STICKY_SECONDS
+    )
+    return user_pk == str(request.user.pk)
+
+
+class ReplicaRouter:
+    """Отправляет чтения в реплику, выбранную для запроса, записи — в default.
+
+    Вне ReplicaReadMixin и без READ_REPLICAS всё идёт в основную БД.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+
+class ReplicaReadMixin:
+    """Читает безопасные запросы из случайной реплики из READ_REPLICAS.
+
+    Одна реплика используется на весь запрос. После записи пользователь
+    читает из основной БД ещё REPLICA_STICKY_SECONDS секунд, чтобы
+    видеть свои изменения, даже если реплика отстаёт.
+    """
+
+    sticky_user = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method not in SAFE_METHODS:
+            if request.user.is_authenticated:
+                self.sticky_user = request.user
+        elif settings.READ_REPLICAS and not is_sticky(request):
+            read_alias.set(random.choice(settings.READ_REPLICAS))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if self.sticky_user is not None:
+            stick_to_primary(response, self.sticky_user)
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        token = read_alias.set(None)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            read_alias.reset(token)
@@ -0,0 +1,196 @@
+from collections import OrderedDict, defaultdict
+from operator import attrgetter, itemgetter
+
+from django.conf import settings
+from django.shortcuts import get_object_or_404
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from reviews.models import Title
+from .fieldsets import requested_fields
+from .slugs import category_slugs, genre_slugs
+
+
+def column(name, field=None):
+    """Поле из одного столбца values().
+
+    field — поле DRF, чей to_representation применяется к значению, как
+    это делает сериализатор; None он, как и сериализатор, не преобразует.
+    """
+    if field is None:
+        return (name,), itemgetter(name)
+    to_representation = field.to_representation
+
+    def mapper(row):
+        value = row[name]
+        return None if value is None else to_representation(value)
+    return (name,), mapper
+
+
+class RowSerializer:
+    """Представление строк .values() без полей и сериализаторов DRF.
+
+    fields сопоставляет поля ответа в порядке исходного сериализатора
+    со столбцами values() и функцией, строящей значение по строке.
+    Вывод совпадает с выводом исходного сериализатора, включая ?fields=
+    и ?omit=.
+    """
+    fields = OrderedDict()
+
+    def __init__(self, request=None):
+        self.names = requested_fields(request, self.fields)
+        if self.names is None:
+            self.names = list(self.fields)
+        self.mappers = [(name, self.fields[name][1]) for name in self.names]
+        self.columns = {'id'}
+        for name in self.names:
+            self.columns.update(self.fields[name][0])
+
+    def prepare(self, rows):
+        """Дополняет строки данными, которых нет в values()."""
+
+    def serialize(self, rows):
+        rows = list(rows)
+        self.prepare(rows)
+        return [
+            OrderedDict([(name, mapper(row)) for name, mapper in self.mappers])
+            for row in rows
+        ]
+
+
+def catalog_entry(obj):
+    return OrderedDict([('name', obj.name), ('slug', obj.slug)])
+
+
+class TitleRowSerializer(RowSerializer):
+    """Строки произведений в формате TitleSerializer.
+
+    Категории и жанры берутся из кэша slug, поэтому из БД читаются
+    только их id. Категория, ожидающая удаления, выводится как null.
+    """
+    fields = OrderedDict([
+        ('id', column('id')),
+        ('name', column('name')),
+        ('year', column('year')),
+        ('rating', column('rating', serializers.IntegerField())),
+        ('description', column('description')),
+        ('genre', ((), itemgetter('genre'))),
+        ('category', (('category_id',), itemgetter('category'))),
+    ])
+
+    def prepare(self, rows):
+        if 'category' in self.names:
+            categories = category_slugs.by_pk(
+                row['category_id'] for row in rows
+                if row['category_id'] is not None
+            )
+            for row in rows:
+                category = categories.get(row['category_id'])
+                if category is None or category.pending_deletion:
+                    row['category'] = None
+                else:
+                    row['category'] = catalog_entry(category)
+        if 'genre' in self.names:
+            self.prepare_genres(rows)
+
+    def prepare_genres(self, rows):
+        """Связи страницы одним запросом, жанры по имени, как в Genre.Meta."""
+        pairs = list(Title.genre.through.objects.filter(
+            title_id__in=[row['id'] for row in rows]
+        ).values_list('title_id', 'genre_id'))
+        genres = genre_slugs.by_pk(genre_id for _, genre_id in pairs)
+        links = defaultdict(list)
+        for title_id, genre_id in pairs:
+            genre = genres.get(genre_id)
+            if genre is not None:
+                links[title_id].append(genre)
+        for row in rows:
+            row['genre'] = [
+                catalog_entry(genre)
+                for genre in sorted(links[row['id']], key=attrgetter('name'))
+            ]
+
+
+class ReviewRowSerializer(RowSerializer):
+    """Строки отзывов в формате ReviewSerializer."""
+    fields = OrderedDict([
+        ('id', column('id')),
+        ('text', column('text')),
+        ('author', column('author__username')),
+        ('score', column('score')),
+        ('pub_date', column('pub_date', serializers.DateTimeField())),
+    ])
+
+
+class CommentRowSerializer(RowSerializer):
+    """Строки комментариев в формате CommentSerializer."""
+    fields = OrderedDict([
+        ('id', column('id')),
+        ('text', column('text')),
+        ('author', column('author__username')),
+        ('pub_date', column('pub_date', serializers.DateField())),
+    ])
+
+
+class AuthorReviewRowSerializer(ReviewRowSerializer):
+    """Строки отзывов в формате AuthorReviewSerializer."""
+    fields = OrderedDict([
+        *ReviewRowSerializer.fields.items(),
+        ('title', column('title_id')),
+    ])
+
+
+class AuthorCommentRowSerializer(CommentRowSerializer):
+    """Строки комментариев в формате AuthorCommentSerializer."""
+    fields = OrderedDict([
+        *CommentRowSerializer.fields.items(),
+        ('review', column('review_id')),
+        ('title', column('review__title_id')),
+    ])
+
+
+class FastReadMixin:
+    """Ответы GET list и retrieve из .values() через row_serializer_class.
+
+    Отключается настройкой FAST_READ_SERIALIZERS, остальные действия
+    работают через обычные сериализаторы.
+    """
+    row_serializer_class = None
+
+    def use_rows(self):
+        return (
+            settings.FAST_READ_SERIALIZERS
+            and self.row_serializer_class is not None
+            and self.request.method in SAFE_METHODS
+        )
+
+    def get_rows(self, serializer):
+        columns = set(serializer.columns)
+        columns.update(
+            field.lstrip('-') for field in getattr(self, 'cursor_ordering', ())
+        )
+        queryset = self.filter_queryset(self.get_queryset())
+        return queryset.prefetch_related(None).values(*columns)
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_rows():
+            return super().list(request, *args, **kwargs)
+        serializer = self.row_serializer_class(request)
+        rows = self.get_rows(serializer)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(rows))
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.use_rows():
+            return super().retrieve(request, *args, **kwargs)
+        serializer = self.row_serializer_class(request)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            self.get_rows(serializer),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        self.check_object_permissions(request, row)
+        return Response(serializer.serialize([row])[0])
@@ -1,12 +1,25 @@
 from django.contrib.auth import authenticate
 from django.contrib.auth.tokens import default_token_generator
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 from rest_framework.serializers import ModelSerializer, SlugRelatedField
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueValidator
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.deletions import remaining
+from reviews.genres import set_title_genres
+from reviews.models import (MAX_SCORE, MIN_SCORE, Category, Comment,
+                            DeletionJob, Genre, Review, Title)
+from reviews.validators import validate_year
 from users.models import User
+from .fieldsets import SparseFieldsetSerializerMixin
+from .slugs import CachedSlugRelatedField, category_slugs, genre_slugs
+
+MAX_TITLE_IDS = 100
+MAX_BULK_TITLES = 1000
+MAX_IMPORT_REVIEWS = 10000
 
 
 class UserSerializerSignUp(serializers.ModelSerializer):
@@ -29,7 +42,8 @@ class UserSerializerSignUp(serializers.ModelSerializer):
         return attrs
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetSerializerMixin,
+                     serializers.ModelSerializer):
     """Сериализатор для модели User"""
 
     class Meta:
@@ -91,9 +105,13 @@ class CategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ('name', 'slug')
+        # slug занят и категорией, ожидающей фонового удаления.
+        extra_kwargs = {'slug': {'validators': [
+            UniqueValidator(queryset=Category.all_objects.all())
+        ]}}
 
 
-class CommentSerializer(ModelSerializer):
+class CommentSerializer(SparseFieldsetSerializerMixin, ModelSerializer):
     author = SlugRelatedField(slug_field='username', read_only=True)
 
     class Meta:
@@ -108,7 +126,8 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsetSerializerMixin,
+                       serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         slug_field='username',
         read_only=True
@@ -118,20 +137,59 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         fields = ('id', 'text', 'author', 'score', 'pub_date')
 
-    def validate(self, data):
-        title = self.context['view'].kwargs.get('titles_id')
-        user = self.context['request'].user
-        if self.context['request'].method == 'POST':
-            if Review.objects.filter(title=title, author=user).exists():
-                raise serializers.ValidationError(
-                    'Можно оставить только 1 отзыв на произведение.'
-                )
-        return data
+    def create(self, validated_data):
+        """Вставляет отзыв без предварительной проверки на повтор.
+
+        Единственность отзыва автора на произведение обеспечивает
+        ограничение title_author, в том числе при параллельных запросах.
+        """
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            if not Review.objects.filter(
+                title=validated_data['title'],
+                author=validated_data['author']
+            ).exists():
+                raise
+        raise serializers.ValidationError({
+            api_settings.NON_FIELD_ERRORS_KEY: [
+                'Можно оставить только 1 отзыв на произведение.'
+            ]
+        })
+
+
+class AuthorReviewSerializer(ReviewSerializer):
+    """Отзыв в ленте автора вместе с id произведения."""
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ReviewSerializer.Meta.fields + ('title',)
+        read_only_fields = ('title',)
+
+
+class AuthorCommentSerializer(CommentSerializer):
+    """Комментарий в ленте автора вместе с id отзыва и произведения."""
+    title = serializers.IntegerField(source='review.title_id', read_only=True)
+
+    class Meta(CommentSerializer.Meta):
+        fields = CommentSerializer.Meta.fields + ('review', 'title')
+        read_only_fields = ('review',)
+
+
+class TitleCategorySerializer(CategorySerializer):
+    """Категория произведения; ожидающая удаления выводится как null."""
 
+    def get_attribute(self, instance):
+        category = super().get_attribute(instance)
+        if category is not None and category.pending_deletion:
+            return None
+        return category
 
-class TitleSerializer(serializers.ModelSerializer):
 
-    category = CategorySerializer()
+class TitleSerializer(SparseFieldsetSerializerMixin,
+                      serializers.ModelSerializer):
+
+    category = TitleCategorySerializer()
     genre = GenreSerializer(many=True)
     rating = serializers.IntegerField(default=None, read_only=True)
 
@@ -148,18 +206,167 @@ class TitleSerializer(serializers.ModelSerializer):
         )
 
 
+class TitleIdsSerializer(serializers.Serializer):
+    """Сериализатор списка id произведений для пакетного получения"""
+    ids = serializers.CharField()
+
+    def validate_ids(self, value):
+        try:
+            ids = [int(title_id) for title_id in value.split(',') if title_id]
+        except ValueError:
+            raise serializers.ValidationError(
+                'Укажите id произведений через запятую.'
+            )
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            raise serializers.ValidationError('Укажите id произведений.')
+        if len(ids) > MAX_TITLE_IDS:
+            raise serializers.ValidationError(
+                f'Можно запросить не больше {MAX_TITLE_IDS} произведений.'
+            )
+        return ids
+
+
 class TitleCreateUpdateSerializer(serializers.ModelSerializer):
 
-    category = serializers.SlugRelatedField(
-        slug_field='slug',
-        queryset=Category.objects.all(),
+    category = CachedSlugRelatedField(category_slugs)
+    genre = CachedSlugRelatedField(genre_slugs, many=True)
+
+    class Meta:
+        model = Title
+        exclude = ('reviews_count', 'score_sum', 'rating', 'modified')
+
+    def create(self, validated_data):
+        """Добавляет жанры нового произведения одним INSERT."""
+        genres = validated_data.pop('genre')
+        instance = super().create(validated_data)
+        set_title_genres(instance, genres, current=set())
+        return instance
+
+    def update(self, instance, validated_data):
+        """Меняет только отличающиеся связи с жанрами вместо set()."""
+        genres = validated_data.pop('genre', None)
+        instance = super().update(instance, validated_data)
+        if genres is not None:
+            set_title_genres(instance, genres)
+        return instance
+
+
+class TitleGenresSerializer(serializers.Serializer):
+    """Сериализатор добавления и удаления жанров у списка произведений."""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=MAX_BULK_TITLES
+    )
+    add = serializers.ListField(
+        child=serializers.SlugField(),
+        required=False,
+        default=list
     )
-    genre = serializers.SlugRelatedField(
-        slug_field='slug',
-        queryset=Genre.objects.all(),
-        many=True,
+    remove = serializers.ListField(
+        child=serializers.SlugField(),
+        required=False,
+        default=list
     )
 
+    def validate_ids(self, ids):
+        ids = set(ids)
+        found = set(Title.objects.filter(pk__in=ids).values_list(
+            'pk', flat=True
+        ))
+        missing = sorted(ids - found)
+        if missing:
+            raise serializers.ValidationError(
+                f'Произведения не найдены: {missing}.'
+            )
+        return found
+
+    def validate(self, attrs):
+        add = list(dict.fromkeys(attrs['add']))
+        remove = list(dict.fromkeys(attrs['remove']))
+        if not add and not remove:
+            raise serializers.ValidationError(
+                'Укажите жанры в add или remove.'
+            )
+        if set(add) & set(remove):
+            raise serializers.ValidationError(
+                'Жанр нельзя одновременно добавить и удалить.'
+            )
+        genres = Genre.objects.in_bulk(add + remove, field_name='slug')
+        unknown = [slug for slug in add + remove if slug not in genres]
+        if unknown:
+            raise serializers.ValidationError(
+                {'genre': [f'Жанр {slug} не найден.' for slug in unknown]}
+            )
+        attrs['add'] = [genres[slug] for slug in add]
+        attrs['remove'] = [genres[slug] for slug in remove]
+        return attrs
+
+
+class TitleBulkItemSerializer(serializers.Serializer):
+    """Сериализатор элемента пакетного создания и изменения произведений.
+
+    Связанные категории и жанры проверяются одним запросом на всю пачку.
+    """
+    id = serializers.IntegerField(required=False)
+    name = serializers.CharField(max_length=150, required=False)
+    year = serializers.IntegerField(
+        required=False,
+        validators=[validate_year]
+    )
+    description = serializers.CharField(
+        required=False,
+        allow_blank=True,
+        allow_null=True
+    )
+    category = serializers.SlugField(required=False, allow_null=True)
+    genre = serializers.ListField(
+        child=serializers.SlugField(),
+        required=False,
+        allow_empty=False
+    )
+
+    def validate(self, attrs):
+        if 'id' not in attrs:
+            missing = [field for field in ('name', 'year', 'genre')
+                       if field not in attrs]
+            if missing:
+                raise serializers.ValidationError(
+                    {field: 'Обязательное поле.' for field in missing}
+                )
+        return attrs
+
+
+class ReviewImportItemSerializer(serializers.Serializer):
+    """Сериализатор строки импорта отзывов.
+
+    Произведения, авторы и повторные отзывы проверяются одним запросом
+    на всю пачку.
+    """
+    title_id = serializers.IntegerField()
+    author = serializers.CharField(max_length=150)
+    text = serializers.CharField()
+    score = serializers.IntegerField(
+        min_value=MIN_SCORE,
+        max_value=MAX_SCORE,
+        error_messages={
+            'min_value': f'Поставьте оценку от {MIN_SCORE} до {MAX_SCORE}',
+            'max_value': f'Поставьте оценку от {MIN_SCORE} до {MAX_SCORE}',
+        }
+    )
+    pub_date = serializers.DateTimeField(required=False)
+
+
+class DeletionJobSerializer(serializers.ModelSerializer):
+    remaining = serializers.SerializerMethodField()
+
     class Meta:
-        model = Title
-        fields = '__all__'
+        model = DeletionJob
+        fields = (
+            'id', 'target', 'object_id', 'object_repr', 'status', 'stage',
+            'processed', 'remaining', 'created', 'finished'
+        )
+
+    def get_remaining(self, obj):
+        return remaining(obj)
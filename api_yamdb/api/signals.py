@@ -0,0 +1,70 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.deletions import deletion_progress
+from reviews.models import Category, DeletionJob, Genre, Review, Title
+from .cache import invalidate
+from .slugs import SLUG_CACHES
+
+# Какие пространства кэша каталога устаревают при изменении модели.
+CACHE_DEPENDENCIES = {
+    Category: ('categories', 'titles'),
+    Genre: ('genres', 'titles'),
+    Title: ('titles',),
+    Review: ('titles',),
+}
+
+
+def invalidate_on_commit(*namespaces):
+    """Сдвигает версии сразу и ещё раз после коммита.
+
+    Повторный сброс не даёт закэшировать под новой версией ответ,
+    прочитанный другим запросом до коммита записи.
+    """
+    invalidate(*namespaces)
+    transaction.on_commit(lambda: invalidate(*namespaces))
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_catalog_cache(sender, **kwargs):
+    """Сбрасывает кэш каталога при изменении связанных моделей."""
+    namespaces = CACHE_DEPENDENCIES.get(sender)
+    if namespaces:
+        invalidate_on_commit(*namespaces)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, action, **kwargs):
+    """Сбрасывает кэш произведений при изменении их жанров."""
+    if action.startswith('post_'):
+        invalidate_on_commit('titles')
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_slug_cache(sender, **kwargs):
+    """Сбрасывает кэш slug сразу и ещё раз после коммита.
+
+    Повторный сброс не даёт другим процессам сохранить в кэше данные,
+    прочитанные до коммита.
+    """
+    slug_cache = SLUG_CACHES[sender]
+    slug_cache.invalidate()
+    transaction.on_commit(slug_cache.invalidate)
+
+
+@receiver(deletion_progress, sender=DeletionJob)
+def invalidate_deleted_objects(sender, job, **kwargs):
+    """Сбрасывает кэши после скрытия объекта и каждой пачки удаления.
+
+    Фоновое удаление меняет строки через update() и DELETE без сигналов
+    моделей.
+    """
+    invalidate('titles')
+    if job.target == DeletionJob.CATEGORY:
+        invalidate('categories')
+        SLUG_CACHES[Category].invalidate()
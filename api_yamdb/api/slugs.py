@@ -0,0 +1,112 @@
+from time import monotonic
+from uuid import uuid4
+
+from django.conf import settings
+from django.utils.encoding import smart_str
+from rest_framework import serializers
+
+from reviews.models import Category, Genre
+from .cache import CACHE_PREFIX, get_cache
+
+
+class SlugCache:
+    """Кэш всех объектов небольшой модели в памяти процесса по slug и pk.
+
+    Актуальность проверяется по версии в кэше каталога, которую сигналы
+    меняют при сохранении и удалении объектов. Версия общая для процессов
+    только при общем бэкенде CATALOG_CACHE_ALIAS (Redis, Memcached, БД),
+    поэтому таблица перечитывается и не реже раза в SLUG_CACHE_TIMEOUT
+    секунд: с LocMemCache это ограничивает расхождение процессов.
+    """
+
+    def __init__(self, model, namespace):
+        self.model = model
+        self.namespace = namespace
+        self.state = (None, None, {}, {})
+
+    def __deepcopy__(self, memo):
+        # Поля DRF копируются для каждого сериализатора, кэш должен быть общим.
+        return self
+
+    @property
+    def version_key(self):
+        return f'{CACHE_PREFIX}:{self.namespace}:version'
+
+    def invalidate(self):
+        """Сбрасывает кэш во всех процессах."""
+        self.state = (None, None, {}, {})
+        get_cache().set(self.version_key, uuid4().hex, None)
+
+    def load(self, force=False):
+        """Возвращает словари объектов по slug и по pk для текущей версии.
+
+        force перечитывает таблицу, даже если версия не изменилась.
+        """
+        cache = get_cache()
+        cache.add(self.version_key, uuid4().hex, None)
+        version = cache.get(self.version_key)
+        loaded, loaded_at, by_slug, by_pk = self.state
+        now = monotonic()
+        if (
+            force
+            or version is None
+            or version != loaded
+            or now - loaded_at >= settings.SLUG_CACHE_TIMEOUT
+        ):
+            # По pk доступны и объекты, ожидающие удаления: на них ещё
+            # ссылаются записи, а выбрать их по slug уже нельзя. Кэш общий
+            # для запросов процесса, поэтому читается из основной БД, а не
+            # из реплики текущего запроса.
+            objects = list(self.model._base_manager.using('default'))
+            by_slug = {
+                obj.slug: obj for obj in objects
+                if not getattr(obj, 'pending_deletion', False)
+            }
+            by_pk = {obj.pk: obj for obj in objects}
+            self.state = (version, now, by_slug, by_pk)
+        return by_slug, by_pk
+
+    def lookup(self, index, keys):
+        """Словарь index из load(), перечитанный, если каких-то keys нет.
+
+        Объект мог появиться в другом процессе, чья смена версии этому
+        процессу ещё не видна. Ключей нет и после перечитывания, только
+        если объекты удалены.
+        """
+        found = self.load()[index]
+        if any(key not in found for key in keys):
+            found = self.load(force=True)[index]
+        return found
+
+    def by_slug(self, slugs=()):
+        return self.lookup(0, slugs)
+
+    def by_pk(self, pks=()):
+        return self.lookup(1, pks)
+
+
+category_slugs = SlugCache(Category, 'category_slugs')
+genre_slugs = SlugCache(Genre, 'genre_slugs')
+
+SLUG_CACHES = {Category: category_slugs, Genre: genre_slugs}
+
+
+class CachedSlugRelatedField(serializers.SlugRelatedField):
+    """SlugRelatedField, который ищет объект в SlugCache, а не в БД."""
+
+    def __init__(self, slug_cache, **kwargs):
+        self.slug_cache = slug_cache
+        kwargs.setdefault('queryset', slug_cache.model.objects.all())
+        super().__init__(slug_field='slug', **kwargs)
+
+    def to_internal_value(self, data):
+        try:
+            obj = self.slug_cache.by_slug([data]).get(data)
+        except TypeError:
+            self.fail('invalid')
+        if obj is None:
+            self.fail(
+                'does_not_exist', slug_name=self.slug_field,
+                value=smart_str(data)
+            )
+        return obj
@@ -1,9 +1,11 @@
-from django.urls import include, path
+from django.urls import include, path, re_path
 from rest_framework import routers
 
-from .views import (APISignUp, CategoryViewSet, CommentViewSet,
-                    CustomTokenObtainPairView, GenreViewSet, ReviewViewSet,
-                    TitleViewSet, UserViewSet)
+from .views import (APISignUp, AuthorCommentViewSet, AuthorReviewViewSet,
+                    CatalogCacheStatsView, CategoryViewSet, CommentViewSet,
+                    CustomTokenObtainPairView, DeletionJobViewSet, ExportView,
+                    GenreViewSet, LeaderboardViewSet, ReviewImportView,
+                    ReviewViewSet, TitleViewSet, UserViewSet)
 
 router_v1 = routers.DefaultRouter()
 router_v1.register(
@@ -19,7 +21,23 @@ router_v1.register(
 router_v1.register('genres', GenreViewSet, basename='genres')
 router_v1.register('titles', TitleViewSet, basename='titles')
 router_v1.register('users', UserViewSet, basename='users')
+router_v1.register(
+    r'users/(?P<username>[^/.]+)/reviews',
+    AuthorReviewViewSet,
+    basename='author_reviews'
+)
+router_v1.register(
+    r'users/(?P<username>[^/.]+)/comments',
+    AuthorCommentViewSet,
+    basename='author_comments'
+)
 router_v1.register('categories', CategoryViewSet, basename='categories')
+router_v1.register('deletions', DeletionJobViewSet, basename='deletions')
+router_v1.register(
+    'leaderboards',
+    LeaderboardViewSet,
+    basename='leaderboards'
+)
 
 urlpatterns = [
     path(
@@ -28,5 +46,20 @@ urlpatterns = [
         name='token_custom'
     ),
     path('v1/auth/signup/', APISignUp.as_view(), name='signup'),
+    path(
+        'v1/cache/stats/',
+        CatalogCacheStatsView.as_view(),
+        name='cache_stats'
+    ),
+    re_path(
+        r'^v1/export/(?P<dataset>\w+)\.(?P<fmt>csv|ndjson)$',
+        ExportView.as_view(),
+        name='export'
+    ),
+    path(
+        'v1/reviews/import/',
+        ReviewImportView.as_view(),
+        name='review_import'
+    ),
     path('v1/', include(router_v1.urls)),
 ]
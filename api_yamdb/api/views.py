@@ -1,59 +1,194 @@
+from functools import partial
+
+from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
 from django.core.mail import send_mail
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from django.db.models import Avg
+from django.utils.functional import cached_property
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, status, viewsets
+from rest_framework import filters, mixins, serializers, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.pagination import (LimitOffsetPagination,
-                                       PageNumberPagination)
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenViewBase
 
 from api_yamdb.settings import ADDR_SENT_EMAIL
-from reviews.models import Category, Genre, Review, Title
+from reviews.genres import retag_titles
+from reviews.models import (SCORE_FIELDS, Category, Comment, DeletionJob,
+                            Genre, LeaderboardEntry, Review, Title)
+from reviews.ratings import score_histogram
 from users.models import User
-from .filters import TitleFilter
-from .mixins import ListCreateDestroyViewset
-from .permissions import (AdminOrReadOnly, IsAdminorReadOnly,
+from .bulk import bulk_import_reviews, bulk_save_titles
+from .cache import CatalogCacheMixin, cache_stats
+from .conditional import (ConditionalGetMixin, conditional, review_modified,
+                          title_modified)
+from .fieldsets import SparseFieldsetMixin
+from .export import DATASETS, EXPORT_FORMATS
+from .filters import TitleFilter, TitleSearchFilter, title_facets
+from .mixins import (BackgroundDestroyMixin, ListCreateDestroyViewset,
+                     query_flag)
+from .pagination import (CursorLimitOffsetPagination,
+                         CursorPageNumberPagination)
+from .parsers import NDJSONParser, ORJSONParser
+from .permissions import (AdminOrReadOnly, IsAdmin, IsAdminorReadOnly,
                           ReviewCommentPermission)
-from .serializers import (APITokenObtainSerializer, CategorySerializer,
-                          CommentSerializer, GenreSerializer, ReviewSerializer,
-                          TitleCreateUpdateSerializer, TitleSerializer,
-                          UserSerializer, UserSerializerMe,
-                          UserSerializerSignUp)
+from .replicas import ReplicaReadMixin
+from .rows import (AuthorCommentRowSerializer, AuthorReviewRowSerializer,
+                   CommentRowSerializer, FastReadMixin, ReviewRowSerializer,
+                   TitleRowSerializer)
+from .serializers import (MAX_BULK_TITLES, MAX_IMPORT_REVIEWS,
+                          APITokenObtainSerializer, AuthorCommentSerializer,
+                          AuthorReviewSerializer, CategorySerializer,
+                          CommentSerializer, DeletionJobSerializer,
+                          GenreSerializer, ReviewSerializer,
+                          TitleCreateUpdateSerializer, TitleGenresSerializer,
+                          TitleIdsSerializer, TitleSerializer, UserSerializer,
+                          UserSerializerMe, UserSerializerSignUp)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ReplicaReadMixin, ConditionalGetMixin,
+                    SparseFieldsetMixin, FastReadMixin, viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
+    row_serializer_class = ReviewRowSerializer
     permission_classes = (ReviewCommentPermission,)
+    cursor_ordering = ('-pub_date', '-id')
+    sparse_fields = {
+        'id': (),
+        'text': ('text',),
+        'author': ('author',),
+        'score': ('score',),
+        'pub_date': ('pub_date',),
+    }
+    sparse_select = {'author': 'author'}
+
+    @cached_property
+    def title(self):
+        """Произведение из адреса, читается один раз за запрос."""
+        return get_object_or_404(
+            Title.objects.only('pk', 'modified'),
+            pk=self.kwargs.get('titles_id')
+        )
+
+    def get_modified(self):
+        """Дата изменения списка отзывов или отдельного отзыва."""
+        if self.action == 'retrieve':
+            return review_modified(
+                self.kwargs.get('titles_id'), self.kwargs.get('pk')
+            )
+        return self.title.modified
 
     def get_queryset(self):
-        """Переопределение метода получения queryset."""
-        title = get_object_or_404(Title, pk=self.kwargs.get('titles_id'))
-        return title.reviews.all()
+        """Отзывы произведения вместе с авторами."""
+        return Review.objects.filter(title=self.title).select_related(
+            'author'
+        )
 
     def perform_create(self, serializer):
         """Переопределение метода create."""
-        title = get_object_or_404(Title, pk=self.kwargs.get('titles_id'))
-        serializer.save(author=self.request.user, title=title)
+        serializer.save(author=self.request.user, title=self.title)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ReplicaReadMixin, ConditionalGetMixin,
+                     SparseFieldsetMixin, FastReadMixin,
+                     viewsets.ModelViewSet):
     serializer_class = CommentSerializer
+    row_serializer_class = CommentRowSerializer
     permission_classes = (ReviewCommentPermission,)
+    cursor_ordering = ('-pub_date', '-id')
+    sparse_fields = {
+        'id': (),
+        'text': ('text',),
+        'author': ('author',),
+        'pub_date': ('pub_date',),
+    }
+    sparse_select = {'author': 'author'}
+
+    @cached_property
+    def review(self):
+        """Отзыв из адреса, принадлежащий произведению из адреса.
+
+        Читается одним запросом один раз за запрос.
+        """
+        return get_object_or_404(
+            Review.objects.only('pk', 'modified'),
+            pk=self.kwargs.get('review_id'),
+            title_id=self.kwargs.get('titles_id'),
+            title__pending_deletion=False
+        )
+
+    def get_modified(self):
+        """Дата изменения отзыва, к которому относятся комментарии."""
+        return self.review.modified
 
     def get_queryset(self):
-        """Переопределение метода получения queryset."""
-        review = get_object_or_404(Review, pk=self.kwargs.get('review_id'))
-        return review.comments.all()
+        """Комментарии отзыва вместе с авторами."""
+        return Comment.objects.filter(review=self.review).select_related(
+            'author'
+        )
 
     def perform_create(self, serializer):
         """Переопределение метода create."""
-        review = get_object_or_404(Review, pk=self.kwargs.get('review_id'))
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.review)
+
+
+class AuthorFeedMixin:
+    """Лента записей автора из адреса, новые сначала.
+
+    Запросы идут по индексам (author, pub_date), поэтому их стоимость
+    зависит от количества записей автора, а не от размера таблицы.
+    """
+    permission_classes = (ReviewCommentPermission,)
+    pagination_class = CursorLimitOffsetPagination
+    cursor_ordering = ('-pub_date', '-id')
+    sparse_select = {'author': 'author'}
+
+    @cached_property
+    def author(self):
+        """Автор из адреса, читается один раз за запрос."""
+        return get_object_or_404(
+            User.objects.only('pk'),
+            username=self.kwargs.get('username'),
+            pending_deletion=False
+        )
+
+
+class AuthorReviewViewSet(ReplicaReadMixin, AuthorFeedMixin,
+                          SparseFieldsetMixin, FastReadMixin,
+                          mixins.ListModelMixin, viewsets.GenericViewSet):
+    """Отзывы пользователя."""
+    serializer_class = AuthorReviewSerializer
+    row_serializer_class = AuthorReviewRowSerializer
+    sparse_fields = {
+        **ReviewViewSet.sparse_fields,
+        'title': ('title',),
+    }
+
+    def get_queryset(self):
+        return Review.objects.filter(
+            author=self.author, title__pending_deletion=False
+        ).select_related('author').order_by(*self.cursor_ordering)
+
+
+class AuthorCommentViewSet(ReplicaReadMixin, AuthorFeedMixin,
+                           SparseFieldsetMixin, FastReadMixin,
+                           mixins.ListModelMixin, viewsets.GenericViewSet):
+    """Комментарии пользователя."""
+    serializer_class = AuthorCommentSerializer
+    row_serializer_class = AuthorCommentRowSerializer
+    sparse_fields = {
+        **CommentViewSet.sparse_fields,
+        'review': ('review',),
+        'title': ('review__title',),
+    }
+    sparse_select = {'author': 'author', 'title': 'review'}
+
+    def get_queryset(self):
+        return Comment.objects.filter(
+            author=self.author, review__title__pending_deletion=False
+        ).select_related('author', 'review').order_by(*self.cursor_ordering)
 
 
 class CustomTokenObtainPairView(TokenViewBase):
@@ -98,14 +233,23 @@ class APISignUp(APIView):
             return Response(response, status=status.HTTP_400_BAD_REQUEST)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(BackgroundDestroyMixin, SparseFieldsetMixin,
+                  viewsets.ModelViewSet):
     """View-класс для модели Post."""
 
-    queryset = User.objects.all()
+    queryset = User.objects.filter(pending_deletion=False)
     serializer_class = UserSerializer
     lookup_field = 'username'
-    pagination_class = LimitOffsetPagination
+    pagination_class = CursorLimitOffsetPagination
     permission_classes = (AdminOrReadOnly,)
+    sparse_fields = {
+        'username': ('username',),
+        'email': ('email',),
+        'first_name': ('first_name',),
+        'last_name': ('last_name',),
+        'bio': ('bio',),
+        'role': ('role',),
+    }
 
     @action(
         detail=False,
@@ -136,39 +280,277 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class CategoryViewSet(ListCreateDestroyViewset):
+class CategoryViewSet(ReplicaReadMixin, CatalogCacheMixin,
+                      BackgroundDestroyMixin, ListCreateDestroyViewset):
     """View-класс для модели Category."""
+    cache_namespace = 'categories'
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = (IsAdminorReadOnly,)
-    pagination_class = PageNumberPagination
+    pagination_class = CursorPageNumberPagination
+    cursor_ordering = ('name', 'id')
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
 
 
-class GenreViewSet(ListCreateDestroyViewset):
+class GenreViewSet(ReplicaReadMixin, CatalogCacheMixin,
+                   ListCreateDestroyViewset):
     """View-класс для модели Genre."""
+    cache_namespace = 'genres'
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = (IsAdminorReadOnly,)
-    pagination_class = PageNumberPagination
+    pagination_class = CursorPageNumberPagination
+    cursor_ordering = ('name', 'id')
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(ReplicaReadMixin, CatalogCacheMixin, SparseFieldsetMixin,
+                   FastReadMixin, BackgroundDestroyMixin,
+                   viewsets.ModelViewSet):
     """View-класс для модели Title."""
-    queryset = Title.objects.annotate(rating=Avg('reviews__score'))
+    cache_namespace = 'titles'
+    sparse_fields = {
+        'id': (),
+        'name': ('name',),
+        'year': ('year',),
+        'rating': ('rating',),
+        'description': ('description',),
+        'genre': (),
+        'category': (
+            'category__name', 'category__slug', 'category__pending_deletion'
+        ),
+    }
+    sparse_select = {'category': 'category'}
+    sparse_prefetch = {'genre': 'genre'}
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre')
     serializer_class = TitleSerializer
+    row_serializer_class = TitleRowSerializer
     permission_classes = (IsAdminorReadOnly,)
-    pagination_class = PageNumberPagination
-    filter_backends = (DjangoFilterBackend,)
+    pagination_class = CursorPageNumberPagination
+    cursor_ordering = ('name', 'id')
+    filter_backends = (DjangoFilterBackend, TitleSearchFilter)
     filterset_class = TitleFilter
 
+    def retrieve(self, request, *args, **kwargs):
+        """Получение произведения с проверкой ETag и через кэш каталога."""
+        return conditional(
+            request,
+            title_modified(kwargs.get('pk')),
+            partial(self.cached, self.title_detail),
+            *args,
+            **kwargs
+        )
+
+    def title_detail(self, request, *args, **kwargs):
+        """Произведение, с ?scores=true — вместе с распределением оценок."""
+        response = super().retrieve(request, *args, **kwargs)
+        if query_flag(request, 'scores'):
+            response.data['scores'] = score_histogram(
+                self.title_scores(kwargs['pk'])
+            )
+        return response
+
+    @action(detail=True, methods=['get'])
+    def scores(self, request, pk=None):
+        """Количество отзывов и распределение оценок произведения."""
+        return self.cached(self.score_counts, request, pk)
+
+    def title_scores(self, pk):
+        row = Title.objects.filter(pk=pk).values(
+            'reviews_count', *SCORE_FIELDS.values()
+        ).first()
+        if row is None:
+            raise NotFound
+        return row
+
+    def score_counts(self, request, pk):
+        row = self.title_scores(pk)
+        return Response({
+            'reviews_count': row['reviews_count'],
+            'scores': score_histogram(row),
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """Количество произведений по жанрам, категориям и годам."""
+        return self.cached(self.facet_counts, request)
+
+    @action(detail=False, methods=['get'])
+    def batch(self, request):
+        """Получение произведений по списку id в порядке запроса."""
+        return self.cached(self.titles_by_ids, request)
+
+    @action(
+        detail=False,
+        methods=['post'],
+        parser_classes=(ORJSONParser, NDJSONParser)
+    )
+    def bulk(self, request):
+        """Пакетное создание и изменение произведений.
+
+        Принимает JSON-массив или NDJSON. Элементы с id обновляют
+        произведения, без id — создают; ошибки возвращаются по элементам.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            raise serializers.ValidationError(
+                {'non_field_errors': ['Ожидается список произведений.']}
+            )
+        if len(items) > MAX_BULK_TITLES:
+            raise serializers.ValidationError({'non_field_errors': [
+                f'Не больше {MAX_BULK_TITLES} произведений за запрос.'
+            ]})
+        return Response(
+            {'results': bulk_save_titles(items)},
+            status=status.HTTP_200_OK
+        )
+
+    @action(detail=False, methods=['post'])
+    def genres(self, request):
+        """Добавление и удаление жанров у многих произведений сразу."""
+        serializer = TitleGenresSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        added, removed = retag_titles(
+            serializer.validated_data['ids'],
+            add=serializer.validated_data['add'],
+            remove=serializer.validated_data['remove'],
+        )
+        return Response(
+            {'added': added, 'removed': removed},
+            status=status.HTTP_200_OK
+        )
+
+    def titles_by_ids(self, request):
+        ids_serializer = TitleIdsSerializer(data=request.query_params)
+        ids_serializer.is_valid(raise_exception=True)
+        ids = ids_serializer.validated_data['ids']
+        queryset = self.filter_queryset(self.get_queryset())
+        titles = queryset.in_bulk(ids)
+        serializer = self.get_serializer(
+            [titles[pk] for pk in ids if pk in titles], many=True
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    def facet_counts(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(title_facets(queryset), status=status.HTTP_200_OK)
+
     def get_serializer_class(self):
         """Переопределение метода получения сериализатора."""
         if self.action in ('create', 'partial_update',):
             return TitleCreateUpdateSerializer
         return TitleSerializer
+
+
+class CatalogCacheStatsView(APIView):
+    """View-класс для счётчиков кэша каталога"""
+    permission_classes = (IsAdmin,)
+
+    def get(self, request):
+        return Response(cache_stats(), status=status.HTTP_200_OK)
+
+
+class ExportView(APIView):
+    """View-класс потоковой выгрузки каталога и отзывов в CSV или NDJSON"""
+    permission_classes = (IsAdmin,)
+
+    def perform_content_negotiation(self, request, force=False):
+        """Формат задаётся расширением в адресе, а не заголовком Accept."""
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, dataset, fmt):
+        if dataset not in DATASETS:
+            raise NotFound(f'Выгрузка {dataset} не найдена.')
+        content_type, lines = EXPORT_FORMATS[fmt]
+        response = StreamingHttpResponse(
+            lines(dataset), content_type=content_type
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{dataset}.{fmt}"'
+        )
+        return response
+
+
+class ReviewImportView(APIView):
+    """Импорт отзывов из NDJSON или JSON-массива для администратора."""
+    permission_classes = (IsAdmin,)
+    parser_classes = (NDJSONParser, ORJSONParser)
+
+    def post(self, request):
+        """Создаёт отзывы пачками, конфликты и ошибки — по элементам."""
+        items = request.data
+        if not isinstance(items, list):
+            raise serializers.ValidationError(
+                {'non_field_errors': ['Ожидается список отзывов.']}
+            )
+        if len(items) > MAX_IMPORT_REVIEWS:
+            raise serializers.ValidationError({'non_field_errors': [
+                f'Не больше {MAX_IMPORT_REVIEWS} отзывов за запрос.'
+            ]})
+        return Response(
+            {'results': bulk_import_reviews(items)},
+            status=status.HTTP_200_OK
+        )
+
+
+class LeaderboardViewSet(viewsets.GenericViewSet):
+    """View-класс для рейтингов произведений."""
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre')
+    serializer_class = TitleSerializer
+    pagination_class = None
+
+    def list(self, request):
+        """Общий рейтинг произведений."""
+        return self.board(request)
+
+    @action(detail=False, url_path=r'categories/(?P<slug>[-\w]+)')
+    def category(self, request, slug):
+        """Рейтинг произведений категории."""
+        return self.board(
+            request, category=get_object_or_404(Category, slug=slug)
+        )
+
+    @action(detail=False, url_path=r'genres/(?P<slug>[-\w]+)')
+    def genre(self, request, slug):
+        """Рейтинг произведений жанра."""
+        return self.board(
+            request, genre=get_object_or_404(Genre, slug=slug)
+        )
+
+    def board(self, request, category=None, genre=None):
+        try:
+            limit = int(request.query_params.get(
+                'limit', settings.LEADERBOARD_SIZE
+            ))
+        except ValueError:
+            raise serializers.ValidationError(
+                {'limit': 'Укажите целое число.'}
+            )
+        limit = max(0, min(limit, settings.LEADERBOARD_SIZE))
+        ids = list(LeaderboardEntry.objects.filter(
+            category=category, genre=genre
+        ).order_by('-rating', 'title').values_list(
+            'title_id', flat=True
+        )[:limit])
+        titles = self.get_queryset().in_bulk(ids)
+        serializer = self.get_serializer(
+            [titles[pk] for pk in ids if pk in titles], many=True
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class DeletionJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Прогресс фоновых удалений для администратора."""
+    queryset = DeletionJob.objects.all()
+    serializer_class = DeletionJobSerializer
+    permission_classes = (IsAdmin,)
+    pagination_class = CursorLimitOffsetPagination
+    cursor_ordering = ('-created', '-id')
@@ -1,5 +1,6 @@
 import os
 from datetime import timedelta
+from importlib.util import find_spec
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -64,6 +65,48 @@ DATABASES = {
     }
 }
 
+# Реплики основной БД только для чтения, через запятую, например копия
+# файла SQLite: DB_REPLICAS=/path/to/replica.sqlite3
+READ_REPLICAS = []
+
+for number, name in enumerate(
+    filter(None, os.getenv('DB_REPLICAS', '').split(',')), start=1
+):
+    DATABASES[f'replica{number}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name,
+        'TEST': {'MIRROR': 'default'},
+    }
+    READ_REPLICAS.append(f'replica{number}')
+
+DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+
+# Сколько секунд после записи пользователь читает из основной БД.
+REPLICA_STICKY_SECONDS = 10
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api_yamdb',
+    }
+}
+
+CATALOG_CACHE_ALIAS = 'default'
+
+CATALOG_CACHE_TIMEOUT = 300
+
+# Категории и жанры в памяти процесса перечитываются не реже, чем раз в
+# столько секунд, даже если версия в кэше каталога не изменилась.
+SLUG_CACHE_TIMEOUT = 30
+
+# GET list и retrieve произведений, отзывов и комментариев строятся
+# из .values() без сериализаторов DRF.
+FAST_READ_SERIALIZERS = True
+
+LEADERBOARD_MIN_REVIEWS = 3
+
+LEADERBOARD_SIZE = 100
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -99,6 +142,22 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
+RENDERER_CLASSES = [
+    'api.renderers.ORJSONRenderer',
+    'rest_framework.renderers.BrowsableAPIRenderer',
+]
+
+PARSER_CLASSES = [
+    'api.parsers.ORJSONParser',
+    'rest_framework.parsers.FormParser',
+    'rest_framework.parsers.MultiPartParser',
+]
+
+# MessagePack (Accept: application/msgpack) доступен, если установлен msgpack.
+if find_spec('msgpack') is not None:
+    RENDERER_CLASSES.insert(1, 'api.renderers.MessagePackRenderer')
+    PARSER_CLASSES.insert(1, 'api.parsers.MessagePackParser')
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
@@ -106,7 +165,9 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_RENDERER_CLASSES': RENDERER_CLASSES,
+    'DEFAULT_PARSER_CLASSES': PARSER_CLASSES,
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.CursorPageNumberPagination',
     "PAGE_SIZE": 10,
 }
 
@@ -0,0 +1,206 @@
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from users.models import User
+from .leaderboards import refresh_leaderboards
+from .models import (Category, Comment, DeletionJob, LeaderboardEntry, Review,
+                     Title)
+from .ratings import recount_ratings
+from .search import unindex_titles
+
+DELETION_BATCH_SIZE = 500
+
+# Отправляется, когда объект скрыт и после каждой пачки удаления.
+deletion_progress = Signal(providing_args=['job'])
+
+TARGETS = {
+    DeletionJob.TITLE: Title,
+    DeletionJob.USER: User,
+    DeletionJob.CATEGORY: Category,
+}
+
+
+def raw_delete(queryset):
+    """DELETE без загрузки объектов и сигналов, как быстрое удаление Django.
+
+    Агрегаты, кэши и индексы, которые поддерживают сигналы, шаги удаления
+    обновляют сами.
+    """
+    return queryset._raw_delete(queryset.db)
+
+
+def batch_ids(queryset, batch_size):
+    return list(queryset.order_by('pk').values_list('pk', flat=True)[
+        :batch_size
+    ])
+
+
+def touch_reviews(review_ids):
+    Review.objects.filter(pk__in=review_ids).update(modified=timezone.now())
+
+
+def delete_comments(comments, batch_size):
+    """Удаляет пачку комментариев и сдвигает дату изменения их отзывов."""
+    ids = batch_ids(comments, batch_size)
+    review_ids = set(Comment.objects.filter(pk__in=ids).values_list(
+        'review_id', flat=True
+    ))
+    deleted = raw_delete(Comment.objects.filter(pk__in=ids))
+    touch_reviews(review_ids)
+    return deleted
+
+
+def delete_reviews(reviews, batch_size):
+    """Удаляет пачку отзывов с комментариями и пересчитывает рейтинги."""
+    ids = batch_ids(reviews, batch_size)
+    title_ids = set(Review.objects.filter(pk__in=ids).values_list(
+        'title_id', flat=True
+    ))
+    deleted = raw_delete(Comment.objects.filter(review_id__in=ids))
+    deleted += raw_delete(Review.objects.filter(pk__in=ids))
+    recount_ratings(title_ids)
+    refresh_leaderboards(title_ids)
+    return deleted
+
+
+def delete_title_links(pk, batch_size):
+    links = Title.genre.through.objects.filter(title_id=pk)
+    return raw_delete(links.filter(pk__in=batch_ids(links, batch_size)))
+
+
+def clear_category(pk, batch_size):
+    """Снимает категорию с пачки произведений, как SET_NULL."""
+    ids = batch_ids(Title.all_objects.filter(category_id=pk), batch_size)
+    return Title.all_objects.filter(pk__in=ids).update(
+        category=None, modified=timezone.now()
+    )
+
+
+def delete_category_entries(pk, batch_size):
+    entries = LeaderboardEntry.objects.filter(category_id=pk)
+    return raw_delete(entries.filter(pk__in=batch_ids(entries, batch_size)))
+
+
+# Шаги удаления: этап и функция, удаляющая одну пачку и возвращающая
+# количество строк. Шаг повторяется, пока функция не вернёт 0, последний
+# шаг удаляет сам объект.
+STEPS = {
+    DeletionJob.TITLE: (
+        ('comments', lambda pk, size: delete_comments(
+            Comment.objects.filter(review__title_id=pk), size
+        )),
+        ('reviews', lambda pk, size: delete_reviews(
+            Review.objects.filter(title_id=pk), size
+        )),
+        ('genres', delete_title_links),
+    ),
+    DeletionJob.USER: (
+        ('comments', lambda pk, size: delete_comments(
+            Comment.objects.filter(author_id=pk), size
+        )),
+        ('review_comments', lambda pk, size: delete_comments(
+            Comment.objects.filter(review__author_id=pk), size
+        )),
+        ('reviews', lambda pk, size: delete_reviews(
+            Review.objects.filter(author_id=pk), size
+        )),
+    ),
+    DeletionJob.CATEGORY: (
+        ('leaderboards', delete_category_entries),
+        ('titles', clear_category),
+    ),
+}
+
+
+def schedule_deletion(obj):
+    """Скрывает объект и создаёт задание на его фоновое удаление."""
+    target = next(
+        target for target, model in TARGETS.items() if isinstance(obj, model)
+    )
+    with transaction.atomic():
+        changes = {'pending_deletion': True}
+        if target == DeletionJob.USER:
+            changes['is_active'] = False
+        elif target == DeletionJob.TITLE:
+            changes['modified'] = timezone.now()
+        type(obj)._base_manager.filter(pk=obj.pk).update(**changes)
+        job = DeletionJob.objects.create(
+            target=target, object_id=obj.pk, object_repr=str(obj)[:256]
+        )
+        if target == DeletionJob.TITLE:
+            unindex_titles([obj.pk])
+            refresh_leaderboards([obj.pk])
+    deletion_progress.send(sender=DeletionJob, job=job)
+    return job
+
+
+def remaining(job):
+    """Количество строк, которые ещё предстоит удалить или изменить."""
+    if job.status == DeletionJob.DONE:
+        return 0
+    pk = job.object_id
+    if job.target == DeletionJob.TITLE:
+        querysets = (
+            Comment.objects.filter(review__title_id=pk),
+            Review.objects.filter(title_id=pk),
+            Title.genre.through.objects.filter(title_id=pk),
+        )
+    elif job.target == DeletionJob.USER:
+        querysets = (
+            Comment.objects.filter(author_id=pk),
+            Comment.objects.filter(review__author_id=pk).exclude(
+                author_id=pk
+            ),
+            Review.objects.filter(author_id=pk),
+        )
+    else:
+        querysets = (
+            LeaderboardEntry.objects.filter(category_id=pk),
+            Title.all_objects.filter(category_id=pk),
+        )
+    return sum(queryset.count() for queryset in querysets) + 1
+
+
+def run_batch(job, batch_size=DELETION_BATCH_SIZE):
+    """Выполняет одну пачку задания в отдельной транзакции.
+
+    Возвращает False, когда задание завершено.
+    """
+    steps = STEPS[job.target]
+    names = [name for name, _ in steps]
+    start = names.index(job.stage) if job.stage in names else 0
+    with transaction.atomic():
+        for name, step in steps[start:]:
+            deleted = step(job.object_id, batch_size)
+            if deleted:
+                job.stage = name
+                job.processed += deleted
+                break
+        else:
+            model = TARGETS[job.target]
+            deleted, _ = model._base_manager.filter(
+                pk=job.object_id
+            ).delete()
+            job.stage = 'object'
+            job.processed += deleted
+            job.status = DeletionJob.DONE
+            job.finished = timezone.now()
+        job.save()
+    deletion_progress.send(sender=DeletionJob, job=job)
+    return job.status != DeletionJob.DONE
+
+
+def process_deletions(batch_size=DELETION_BATCH_SIZE):
+    """Выполняет все ожидающие задания по порядку создания.
+
+    Возвращает количество завершённых заданий.
+    """
+    finished = 0
+    for job in DeletionJob.objects.filter(
+        status=DeletionJob.PENDING
+    ).order_by('created', 'id'):
+        while run_batch(job, batch_size):
+            pass
+        finished += 1
+    return finished
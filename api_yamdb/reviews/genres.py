@@ -0,0 +1,97 @@
+from django.db import router, transaction
+from django.db.models.signals import m2m_changed
+
+from .models import Genre, Title
+
+TitleGenre = Title.genre.through
+
+
+def send_changed(action, instance, reverse, pk_set):
+    """Отправляет m2m_changed так же, как add() и remove() связи genre."""
+    m2m_changed.send(
+        sender=TitleGenre,
+        action=action,
+        instance=instance,
+        reverse=reverse,
+        model=Title if reverse else Genre,
+        pk_set=pk_set,
+        using=router.db_for_write(TitleGenre, instance=instance),
+    )
+
+
+def remove_links(instance, reverse, pk_set, **lookups):
+    """Удаляет связи, выбранные lookups, одним DELETE."""
+    if not pk_set:
+        return
+    send_changed('pre_remove', instance, reverse, pk_set)
+    TitleGenre.objects.filter(**lookups).delete()
+    send_changed('post_remove', instance, reverse, pk_set)
+
+
+def add_links(instance, reverse, pk_set, links):
+    """Добавляет строки промежуточной таблицы одним INSERT."""
+    if not pk_set:
+        return
+    send_changed('pre_add', instance, reverse, pk_set)
+    TitleGenre.objects.bulk_create(links)
+    send_changed('post_add', instance, reverse, pk_set)
+
+
+def set_title_genres(title, genres, current=None):
+    """Приводит жанры произведения к genres минимальным набором изменений.
+
+    current — id текущих жанров, если они известны (пустое множество для
+    нового произведения); иначе берутся из prefetch_related или из БД.
+    Возвращает id добавленных и удалённых жанров.
+    """
+    prefetched = getattr(title, '_prefetched_objects_cache', {})
+    if current is not None:
+        prefetched.pop('genre', None)
+    elif 'genre' in prefetched:
+        current = {genre.pk for genre in prefetched.pop('genre')}
+    else:
+        current = set(TitleGenre.objects.filter(
+            title_id=title.pk
+        ).values_list('genre_id', flat=True))
+    wanted = {genre.pk for genre in genres}
+    added = wanted - current
+    removed = current - wanted
+    with transaction.atomic():
+        remove_links(
+            title, False, removed, title_id=title.pk, genre_id__in=removed
+        )
+        add_links(title, False, added, [
+            TitleGenre(title_id=title.pk, genre_id=pk) for pk in added
+        ])
+    return added, removed
+
+
+def retag_titles(title_ids, add=(), remove=()):
+    """Добавляет жанры add и убирает жанры remove у произведений title_ids.
+
+    Существующие связи читаются одним запросом, каждый жанр меняется
+    одним DELETE или INSERT. Возвращает количество добавленных и
+    удалённых связей.
+    """
+    title_ids = set(title_ids)
+    existing = set(TitleGenre.objects.filter(
+        title_id__in=title_ids,
+        genre_id__in=[genre.pk for genre in (*add, *remove)],
+    ).values_list('title_id', 'genre_id'))
+    added = removed = 0
+    with transaction.atomic():
+        for genre in remove:
+            pk_set = {pk for pk in title_ids if (pk, genre.pk) in existing}
+            remove_links(
+                genre, True, pk_set, genre_id=genre.pk, title_id__in=pk_set
+            )
+            removed += len(pk_set)
+        for genre in add:
+            pk_set = title_ids - {
+                pk for pk, genre_id in existing if genre_id == genre.pk
+            }
+            add_links(genre, True, pk_set, [
+                TitleGenre(title_id=pk, genre_id=genre.pk) for pk in pk_set
+            ])
+            added += len(pk_set)
+    return added, removed
@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+
+from .models import LeaderboardEntry, Title
+
+REBUILD_CHUNK_SIZE = 1000
+
+
+def write_leaderboards(title_ids):
+    LeaderboardEntry.objects.filter(title_id__in=title_ids).delete()
+    titles = Title.objects.filter(
+        pk__in=title_ids,
+        reviews_count__gte=settings.LEADERBOARD_MIN_REVIEWS,
+    ).values_list('pk', 'rating', 'category_id')
+    ratings = {pk: rating for pk, rating, _ in titles}
+    entries = []
+    for pk, rating, category_id in titles:
+        entries.append(LeaderboardEntry(title_id=pk, rating=rating))
+        if category_id is not None:
+            entries.append(LeaderboardEntry(
+                title_id=pk, category_id=category_id, rating=rating
+            ))
+    links = Title.genre.through.objects.filter(
+        title_id__in=ratings
+    ).values_list('title_id', 'genre_id')
+    for title_id, genre_id in links:
+        entries.append(LeaderboardEntry(
+            title_id=title_id, genre_id=genre_id, rating=ratings[title_id]
+        ))
+    LeaderboardEntry.objects.bulk_create(entries)
+
+
+def refresh_leaderboards(title_ids):
+    """Пересобирает места произведений в общем рейтинге и по разделам.
+
+    В рейтинги попадают произведения с количеством отзывов не меньше
+    LEADERBOARD_MIN_REVIEWS. Удаление и вставка идут в одной
+    транзакции; если другой процесс одновременно вставил места тех же
+    произведений, пересборка повторяется один раз.
+    """
+    title_ids = list(title_ids)
+    try:
+        with transaction.atomic():
+            write_leaderboards(title_ids)
+    except IntegrityError:
+        with transaction.atomic():
+            write_leaderboards(title_ids)
+
+
+class PendingRefresh:
+    """Произведения, рейтинги которых обновятся после коммита транзакции."""
+
+    def __init__(self, title_id):
+        self.title_ids = {title_id}
+
+    def __call__(self):
+        refresh_leaderboards(self.title_ids)
+
+
+def schedule_leaderboard_refresh(title_id):
+    """Откладывает обновление рейтингов произведения до конца транзакции.
+
+    Так каскадное удаление или массовое изменение отзывов обновляет
+    каждое произведение один раз. Набор хранится в обработчике
+    on_commit, поэтому при откате транзакции он отбрасывается вместе
+    с ним.
+    """
+    for _, callback in connection.run_on_commit:
+        if isinstance(callback, PendingRefresh):
+            callback.title_ids.add(title_id)
+            return
+    transaction.on_commit(PendingRefresh(title_id))
+
+
+def rebuild_leaderboards(chunk_size=REBUILD_CHUNK_SIZE):
+    """Заново строит все рейтинги пачками по chunk_size произведений.
+
+    Возвращает количество обработанных произведений.
+    """
+    processed = 0
+    last_pk = 0
+    with transaction.atomic():
+        LeaderboardEntry.objects.all().delete()
+        while True:
+            title_ids = list(Title.objects.filter(pk__gt=last_pk).order_by(
+                'pk'
+            ).values_list('pk', flat=True)[:chunk_size])
+            if not title_ids:
+                return processed
+            refresh_leaderboards(title_ids)
+            processed += len(title_ids)
+            last_pk = title_ids[-1]
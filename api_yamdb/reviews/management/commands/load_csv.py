@@ -0,0 +1,140 @@
+import csv
+import os
+from contextlib import contextmanager
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, models, transaction
+
+from reviews.leaderboards import rebuild_leaderboards
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.ratings import recount_ratings
+from reviews.search import rebuild_search_index
+from users.models import User
+
+DEFAULT_BATCH_SIZE = 5000
+
+# Файлы в порядке зависимостей: модель и переименования столбцов в attname.
+CSV_FILES = (
+    ('users.csv', User, {}),
+    ('category.csv', Category, {}),
+    ('genre.csv', Genre, {}),
+    ('titles.csv', Title, {'category': 'category_id'}),
+    ('genre_title.csv', Title.genre.through, {}),
+    ('review.csv', Review, {'author': 'author_id'}),
+    ('comments.csv', Comment, {'author': 'author_id'}),
+)
+
+
+@contextmanager
+def keep_auto_now_add(model):
+    """Сохраняет даты публикации из файла вместо текущего времени."""
+    fields = [field for field in model._meta.concrete_fields
+              if getattr(field, 'auto_now_add', False)]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def row_converter(model, header, renames):
+    """Готовит функцию, превращающую строку CSV в объект модели."""
+    fields_by_attname = {
+        field.attname: field for field in model._meta.concrete_fields
+    }
+    columns = []
+    for column in header:
+        attname = renames.get(column, column)
+        if attname not in fields_by_attname:
+            raise CommandError(
+                f'Столбец {column} не найден в модели {model.__name__}'
+            )
+        columns.append((attname, fields_by_attname[attname]))
+
+    def convert(row):
+        values = {}
+        for (attname, field), value in zip(columns, row):
+            if value == '' and field.null:
+                value = None
+            elif (isinstance(field, models.DateField)
+                  and not isinstance(field, models.DateTimeField)):
+                value = field.to_python(value[:10])
+            else:
+                value = field.to_python(value)
+            values[attname] = value
+        obj = model(**values)
+        if model is User:
+            obj.set_unusable_password()
+        return obj
+
+    return convert
+
+
+class Command(BaseCommand):
+    help = 'Загружает данные из CSV-файлов static/data в базу данных'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=os.path.join(settings.BASE_DIR, 'static', 'data'),
+            help='Каталог с CSV-файлами',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Количество строк в одном bulk_create',
+        )
+
+    def handle(self, *args, **options):
+        loaded_models = []
+        for filename, model, renames in CSV_FILES:
+            path = os.path.join(options['path'], filename)
+            if not os.path.exists(path):
+                self.stdout.write(f'{filename}: файл не найден, пропущен')
+                continue
+            total = self.load_file(
+                path, model, renames, options['batch_size']
+            )
+            loaded_models.append(model)
+            self.stdout.write(self.style.SUCCESS(
+                f'{filename}: загружено строк {total}'
+            ))
+        self.reset_sequences(loaded_models)
+        if Title in loaded_models:
+            rebuild_search_index()
+        if Title in loaded_models or Review in loaded_models:
+            recount_ratings()
+            rebuild_leaderboards()
+        self.stdout.write(self.style.SUCCESS('Загрузка завершена'))
+
+    def load_file(self, path, model, renames, batch_size):
+        total = 0
+        with open(path, encoding='utf-8', newline='') as csv_file:
+            reader = csv.reader(csv_file)
+            convert = row_converter(model, next(reader), renames)
+            objects = map(convert, reader)
+            with transaction.atomic(), keep_auto_now_add(model):
+                while True:
+                    batch = list(islice(objects, batch_size))
+                    if not batch:
+                        return total
+                    model.objects.bulk_create(batch)
+                    total += len(batch)
+                    self.stdout.write(
+                        f'{os.path.basename(path)}: {total}', ending='\r'
+                    )
+
+    def reset_sequences(self, loaded_models):
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), loaded_models
+        )
+        if statements:
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
@@ -0,0 +1,42 @@
+from time import sleep
+
+from django.core.management.base import BaseCommand
+
+from reviews.deletions import DELETION_BATCH_SIZE, process_deletions
+
+
+class Command(BaseCommand):
+    help = (
+        'Фоновый обработчик: удаляет скрытые произведения, пользователей '
+        'и категории вместе с зависимыми записями пачками'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DELETION_BATCH_SIZE,
+            help='Количество строк, удаляемых в одной транзакции',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Обработать ожидающие задания и завершиться',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=5,
+            help='Пауза в секундах между проверками новых заданий',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            finished = process_deletions(options['batch_size'])
+            if finished:
+                self.stdout.write(
+                    self.style.SUCCESS(f'Завершено удалений: {finished}')
+                )
+            if options['once']:
+                return
+            sleep(options['sleep'])
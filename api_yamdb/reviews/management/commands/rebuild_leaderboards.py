@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from reviews.leaderboards import REBUILD_CHUNK_SIZE, rebuild_leaderboards
+
+
+class Command(BaseCommand):
+    help = 'Заново строит рейтинги произведений по категориям и жанрам'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=REBUILD_CHUNK_SIZE,
+            help='Количество произведений, обрабатываемых за один проход',
+        )
+
+    def handle(self, *args, **options):
+        processed = rebuild_leaderboards(chunk_size=options['chunk_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано произведений: {processed}')
+        )
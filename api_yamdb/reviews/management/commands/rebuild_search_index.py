@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from reviews.search import REBUILD_CHUNK_SIZE, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Заново строит полнотекстовый индекс произведений'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=REBUILD_CHUNK_SIZE,
+            help='Количество произведений, индексируемых за один проход',
+        )
+
+    def handle(self, *args, **options):
+        indexed = rebuild_search_index(chunk_size=options['chunk_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Проиндексировано произведений: {indexed}')
+        )
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from reviews.ratings import RECOUNT_CHUNK_SIZE, recount_ratings
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает количество отзывов и рейтинг произведений'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=RECOUNT_CHUNK_SIZE,
+            help='Количество произведений, пересчитываемых за один проход',
+        )
+
+    def handle(self, *args, **options):
+        processed = recount_ratings(chunk_size=options['chunk_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано произведений: {processed}')
+        )
@@ -0,0 +1,38 @@
+from django.db import migrations
+
+SEARCH_TABLE = 'reviews_title_search'
+
+
+def create_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    Title = apps.get_model('reviews', 'Title')
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5('
+        "name, description, tokenize='unicode61 remove_diacritics 2')"
+    )
+    for pk, name, description in Title.objects.values_list(
+        'pk', 'name', 'description'
+    ).iterator():
+        schema_editor.execute(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, name, description) '
+            'VALUES (%s, %s, %s)',
+            (pk, name, description or ''),
+        )
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f'DROP TABLE {SEARCH_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_title_name_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 2.2.16 on 2026-10-18 17:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+import reviews.lookups
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_title_facet_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleSearch',
+            fields=[
+                ('title', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='reviews.Title')),
+                ('name', models.TextField()),
+                ('description', models.TextField()),
+                ('document', reviews.lookups.SearchDocumentField(db_column='reviews_title_search')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'reviews_title_search',
+                'managed': False,
+            },
+        ),
+    ]
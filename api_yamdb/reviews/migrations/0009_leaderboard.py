@@ -0,0 +1,55 @@
+# Generated by Django 2.2.16 on 2026-10-18 17:22
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_leaderboards(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    LeaderboardEntry = apps.get_model('reviews', 'LeaderboardEntry')
+    titles = Title.objects.filter(
+        reviews_count__gte=settings.LEADERBOARD_MIN_REVIEWS
+    ).prefetch_related('genre')
+    entries = []
+    for title in titles:
+        entries.append(LeaderboardEntry(title=title, rating=title.rating))
+        if title.category_id is not None:
+            entries.append(LeaderboardEntry(
+                title=title, category_id=title.category_id,
+                rating=title.rating
+            ))
+        for genre in title.genre.all():
+            entries.append(LeaderboardEntry(
+                title=title, genre=genre, rating=title.rating
+            ))
+    LeaderboardEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_title_search_model'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rating', models.FloatField(verbose_name='Рейтинг')),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='reviews.Category', verbose_name='Категория')),
+                ('genre', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='reviews.Genre', verbose_name='Жанр')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='reviews.Title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Место в рейтинге',
+                'verbose_name_plural': 'Рейтинги',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['category', 'genre', '-rating', 'title'], name='leaderboard_rank_idx'),
+        ),
+        migrations.RunPython(fill_leaderboards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 2.2.16 on 2026-10-18 17:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_leaderboard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletionJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('target', models.CharField(choices=[('title', 'Произведение'), ('user', 'Пользователь'), ('category', 'Категория')], max_length=16, verbose_name='Тип объекта')),
+                ('object_id', models.PositiveIntegerField(verbose_name='id объекта')),
+                ('object_repr', models.CharField(max_length=256, verbose_name='Объект')),
+                ('status', models.CharField(choices=[('pending', 'Выполняется'), ('done', 'Завершено')], default='pending', max_length=16, verbose_name='Статус')),
+                ('stage', models.CharField(blank=True, max_length=32, verbose_name='Этап')),
+                ('processed', models.PositiveIntegerField(default=0, verbose_name='Обработано строк')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('finished', models.DateTimeField(null=True, verbose_name='Дата завершения')),
+            ],
+            options={
+                'verbose_name': 'Фоновое удаление',
+                'verbose_name_plural': 'Фоновые удаления',
+                'ordering': ('-created', '-id'),
+            },
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='pending_deletion',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Ожидает удаления'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='pending_deletion',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Ожидает удаления'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_nested_list_indexes'),
+    ]
+
+    operations = [
+        # Места, повторённые параллельными пересборками до ограничений.
+        migrations.RunSQL(
+            'DELETE FROM reviews_leaderboardentry WHERE id NOT IN ('
+            'SELECT MIN(id) FROM reviews_leaderboardentry '
+            'GROUP BY title_id, category_id, genre_id)',
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(condition=models.Q(('category__isnull', True), ('genre__isnull', True)), fields=('title',), name='leaderboard_overall_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(condition=models.Q(genre__isnull=True), fields=('title', 'category'), name='leaderboard_category_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(condition=models.Q(category__isnull=True), fields=('title', 'genre'), name='leaderboard_genre_unique'),
+        ),
+    ]
@@ -2,11 +2,25 @@ from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
 from users.models import User
+from .lookups import SearchDocumentField
 from .validators import validate_year
 
 MAX_SCORE = 10
 MIN_SCORE = 1
 
+# Поля произведения с количеством отзывов для каждой оценки.
+SCORE_FIELDS = {
+    score: f'score_{score}_count'
+    for score in range(MIN_SCORE, MAX_SCORE + 1)
+}
+
+
+class VisibleManager(models.Manager):
+    """Менеджер без объектов, ожидающих фонового удаления."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(pending_deletion=False)
+
 
 class Category(models.Model):
     name = models.CharField(
@@ -18,6 +32,14 @@ class Category(models.Model):
         max_length=50,
         verbose_name='Название страницы'
     )
+    pending_deletion = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Ожидает удаления'
+    )
+
+    objects = VisibleManager()
+    all_objects = models.Manager()
 
     class Meta:
         ordering = ['name']
@@ -73,9 +95,43 @@ class Title(models.Model):
         null=True,
         verbose_name='Описание произведения'
     )
+    reviews_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество отзывов'
+    )
+    score_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок'
+    )
+    rating = models.FloatField(
+        null=True,
+        editable=False,
+        verbose_name='Рейтинг'
+    )
+    modified = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения'
+    )
+    pending_deletion = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Ожидает удаления'
+    )
+
+    objects = VisibleManager()
+    all_objects = models.Manager()
 
     class Meta:
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['name', 'id'], name='title_name_id_idx'),
+            models.Index(
+                fields=['category', 'year'], name='title_category_year_idx'
+            ),
+            models.Index(fields=['year'], name='title_year_idx'),
+        ]
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
 
@@ -83,6 +139,85 @@ class Title(models.Model):
         return self.name
 
 
+for score, name in SCORE_FIELDS.items():
+    Title.add_to_class(name, models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=f'Количество оценок {score}'
+    ))
+
+
+class LeaderboardEntry(models.Model):
+    """Место произведения в рейтинге: общем, категории или жанра."""
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='leaderboard_entries',
+        verbose_name='Произведение'
+    )
+    category = models.ForeignKey(
+        Category,
+        null=True,
+        on_delete=models.CASCADE,
+        related_name='leaderboard_entries',
+        verbose_name='Категория'
+    )
+    genre = models.ForeignKey(
+        Genre,
+        null=True,
+        on_delete=models.CASCADE,
+        related_name='leaderboard_entries',
+        verbose_name='Жанр'
+    )
+    rating = models.FloatField(verbose_name='Рейтинг')
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['category', 'genre', '-rating', 'title'],
+                name='leaderboard_rank_idx'
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title'],
+                condition=models.Q(category__isnull=True, genre__isnull=True),
+                name='leaderboard_overall_unique'
+            ),
+            models.UniqueConstraint(
+                fields=['title', 'category'],
+                condition=models.Q(genre__isnull=True),
+                name='leaderboard_category_unique'
+            ),
+            models.UniqueConstraint(
+                fields=['title', 'genre'],
+                condition=models.Q(category__isnull=True),
+                name='leaderboard_genre_unique'
+            ),
+        ]
+        verbose_name = 'Место в рейтинге'
+        verbose_name_plural = 'Рейтинги'
+
+
+class TitleSearch(models.Model):
+    """Строка полнотекстового индекса FTS5 (таблица создаётся миграцией)."""
+    title = models.OneToOneField(
+        Title,
+        primary_key=True,
+        db_column='rowid',
+        on_delete=models.DO_NOTHING,
+        related_name='search_entry',
+    )
+    name = models.TextField()
+    description = models.TextField()
+    document = SearchDocumentField(db_column='reviews_title_search')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'reviews_title_search'
+
+
 class Review(models.Model):
     title = models.ForeignKey(
         Title,
@@ -108,11 +243,25 @@ class Review(models.Model):
     )
     pub_date = models.DateTimeField(
         verbose_name="Дата публикации", auto_now_add=True)
+    modified = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения'
+    )
 
     class Meta:
-        ordering = ('-pub_date',)
+        ordering = ('-pub_date', '-id')
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
+        indexes = [
+            models.Index(
+                fields=['title', '-pub_date', '-id'],
+                name='review_title_pub_date_idx'
+            ),
+            models.Index(
+                fields=['author', 'pub_date'],
+                name='review_author_pub_date_idx'
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['title', 'author'],
@@ -143,9 +292,78 @@ class Comment(models.Model):
     )
 
     class Meta:
-        ordering = ('-pub_date',)
+        ordering = ('-pub_date', '-id')
+        indexes = [
+            models.Index(
+                fields=['review', '-pub_date', '-id'],
+                name='comment_review_pub_date_idx'
+            ),
+            models.Index(
+                fields=['author', 'pub_date'],
+                name='comment_author_pub_date_idx'
+            ),
+        ]
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
 
     def __str__(self):
         return self.text[:30]
+
+
+class DeletionJob(models.Model):
+    """Фоновое удаление произведения, пользователя или категории."""
+    TITLE = 'title'
+    USER = 'user'
+    CATEGORY = 'category'
+    TARGET_CHOICES = [
+        (TITLE, 'Произведение'),
+        (USER, 'Пользователь'),
+        (CATEGORY, 'Категория'),
+    ]
+    PENDING = 'pending'
+    DONE = 'done'
+    STATUS_CHOICES = [
+        (PENDING, 'Выполняется'),
+        (DONE, 'Завершено'),
+    ]
+    target = models.CharField(
+        max_length=16,
+        choices=TARGET_CHOICES,
+        verbose_name='Тип объекта'
+    )
+    object_id = models.PositiveIntegerField(verbose_name='id объекта')
+    object_repr = models.CharField(
+        max_length=256,
+        verbose_name='Объект'
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name='Статус'
+    )
+    stage = models.CharField(
+        max_length=32,
+        blank=True,
+        verbose_name='Этап'
+    )
+    processed = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Обработано строк'
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+    finished = models.DateTimeField(
+        null=True,
+        verbose_name='Дата завершения'
+    )
+
+    class Meta:
+        ordering = ('-created', '-id')
+        verbose_name = 'Фоновое удаление'
+        verbose_name_plural = 'Фоновые удаления'
+
+    def __str__(self):
+        return f'{self.target} {self.object_repr}'
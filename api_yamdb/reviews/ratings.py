@@ -0,0 +1,107 @@
+from collections import Counter, OrderedDict
+
+from django.db.models import (Case, Count, F, FloatField, Q, Sum, Value,
+                              When)
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from .models import SCORE_FIELDS, Review, Title
+
+RECOUNT_CHUNK_SIZE = 1000
+
+
+def rating_expressions(added=(), removed=()):
+    """Выражения для UPDATE, сдвигающие агрегаты отзывов произведения.
+
+    added и removed — оценки добавленных и удалённых отзывов.
+    """
+    scores = Counter(added)
+    scores.subtract(removed)
+    count_delta = sum(scores.values())
+    new_count = F('reviews_count') + count_delta
+    new_sum = F('score_sum') + sum(
+        score * delta for score, delta in scores.items()
+    )
+    expressions = {
+        SCORE_FIELDS[score]: F(SCORE_FIELDS[score]) + delta
+        for score, delta in scores.items() if delta
+    }
+    expressions.update({
+        'reviews_count': new_count,
+        'score_sum': new_sum,
+        'rating': Case(
+            When(
+                reviews_count__lte=-count_delta,
+                then=Value(None),
+            ),
+            default=Cast(new_sum, FloatField()) / new_count,
+            output_field=FloatField(),
+        ),
+    })
+    return expressions
+
+
+def update_title_rating(title_id, added=(), removed=()):
+    """Атомарно применяет изменение отзывов к агрегатам произведения.
+
+    Дата изменения произведения сдвигается при любом изменении отзывов.
+    """
+    Title.objects.filter(pk=title_id).update(
+        modified=timezone.now(),
+        **rating_expressions(added, removed)
+    )
+
+
+def score_histogram(row):
+    """Количество отзывов по оценкам из строки произведения."""
+    return OrderedDict(
+        (str(score), row[name]) for score, name in SCORE_FIELDS.items()
+    )
+
+
+def recount_ratings(title_ids=None, chunk_size=RECOUNT_CHUNK_SIZE):
+    """Пересчитывает агрегаты отзывов пачками по chunk_size произведений.
+
+    Возвращает количество обработанных произведений.
+    """
+    queryset = Title.objects.order_by('pk')
+    if title_ids is not None:
+        queryset = queryset.filter(pk__in=title_ids)
+    processed = 0
+    last_pk = 0
+    while True:
+        titles = list(
+            queryset.filter(pk__gt=last_pk).only('pk')[:chunk_size]
+        )
+        if not titles:
+            return processed
+        stats = {
+            row['title']: row
+            for row in Review.objects.filter(
+                title__in=[title.pk for title in titles]
+            ).order_by().values('title').annotate(
+                count=Count('pk'),
+                total=Sum('score'),
+                **{
+                    name: Count('pk', filter=Q(score=score))
+                    for score, name in SCORE_FIELDS.items()
+                }
+            )
+        }
+        now = timezone.now()
+        for title in titles:
+            row = stats.get(title.pk)
+            title.modified = now
+            title.reviews_count = row['count'] if row else 0
+            title.score_sum = row['total'] if row else 0
+            title.rating = (
+                title.score_sum / title.reviews_count if row else None
+            )
+            for name in SCORE_FIELDS.values():
+                setattr(title, name, row[name] if row else 0)
+        Title.objects.bulk_update(titles, (
+            'reviews_count', 'score_sum', 'rating', 'modified',
+            *SCORE_FIELDS.values()
+        ))
+        processed += len(titles)
+        last_pk = titles[-1].pk
@@ -0,0 +1,98 @@
+import re
+
+from django.db import connection, transaction
+
+from .models import Title
+
+SEARCH_TABLE = 'reviews_title_search'
+REBUILD_CHUNK_SIZE = 1000
+SEARCH_WORD = re.compile(r'\w+')
+
+
+def search_available():
+    """Полнотекстовый индекс есть только у SQLite (FTS5)."""
+    return connection.vendor == 'sqlite'
+
+
+def build_match_query(text):
+    """Превращает строку поиска в запрос FTS5 с поиском по префиксам.
+
+    Каждое слово берётся в кавычки, поэтому синтаксис FTS5 из
+    пользовательского ввода не интерпретируется.
+    """
+    words = SEARCH_WORD.findall(text)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def index_titles(titles):
+    """Добавляет или обновляет произведения в поисковом индексе."""
+    if not search_available():
+        return
+    rows = [(title.pk, title.name, title.description or '')
+            for title in titles]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+            [(row[0],) for row in rows],
+        )
+        cursor.executemany(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, name, description) '
+            'VALUES (%s, %s, %s)',
+            rows,
+        )
+
+
+def unindex_titles(title_ids):
+    """Удаляет произведения из поискового индекса."""
+    if not search_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+            [(title_id,) for title_id in title_ids],
+        )
+
+
+def rebuild_search_index(chunk_size=REBUILD_CHUNK_SIZE):
+    """Заново строит поисковый индекс пачками по chunk_size произведений.
+
+    Возвращает количество проиндексированных произведений.
+    """
+    if not search_available():
+        return 0
+    indexed = 0
+    last_pk = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        while True:
+            titles = Title.objects.filter(pk__gt=last_pk).order_by(
+                'pk'
+            ).values_list('pk', 'name', 'description')[:chunk_size]
+            rows = [(pk, name, description or '')
+                    for pk, name, description in titles]
+            if not rows:
+                return indexed
+            cursor.executemany(
+                f'INSERT INTO {SEARCH_TABLE} (rowid, name, description) '
+                'VALUES (%s, %s, %s)',
+                rows,
+            )
+            indexed += len(rows)
+            last_pk = rows[-1][0]
+
+
+def search_titles(queryset, text):
+    """Отбирает подходящие под запрос произведения по релевантности.
+
+    Без FTS5 используется поиск по вхождению в название.
+    """
+    match = build_match_query(text)
+    if not match:
+        return queryset.none()
+    if not search_available():
+        return queryset.filter(name__icontains=text)
+    return queryset.filter(
+        search_entry__document__match=match
+    ).order_by('search_entry__rank', 'id')
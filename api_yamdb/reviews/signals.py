@@ -0,0 +1,120 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_init,
+                                      post_save, pre_delete)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .leaderboards import schedule_leaderboard_refresh
+from .models import Category, Comment, Genre, Review, Title
+from .ratings import recount_ratings, update_title_rating
+from .search import index_titles, unindex_titles
+
+
+@receiver(post_init, sender=Review)
+def remember_review_score(sender, instance, **kwargs):
+    """Запоминает загруженные из БД произведение и оценку отзыва."""
+    instance._rated = (
+        instance.__dict__.get('title_id'),
+        instance.__dict__.get('score'),
+    )
+
+
+@receiver(post_save, sender=Review)
+def apply_review_score(sender, instance, created, raw=False, **kwargs):
+    """Обновляет агрегаты произведения при создании или изменении отзыва."""
+    if raw:
+        return
+    old_title_id, old_score = instance._rated
+    if created:
+        update_title_rating(instance.title_id, added=[instance.score])
+    elif old_score is None:
+        recount_ratings({old_title_id, instance.title_id})
+    elif old_title_id != instance.title_id:
+        update_title_rating(old_title_id, removed=[old_score])
+        update_title_rating(instance.title_id, added=[instance.score])
+    else:
+        update_title_rating(
+            instance.title_id, added=[instance.score], removed=[old_score]
+        )
+    if created or instance._rated != (instance.title_id, instance.score):
+        for title_id in {old_title_id, instance.title_id} - {None}:
+            schedule_leaderboard_refresh(title_id)
+    instance._rated = (instance.title_id, instance.score)
+
+
+@receiver(post_delete, sender=Review)
+def revert_review_score(sender, instance, **kwargs):
+    """Вычитает удалённый отзыв из агрегатов произведения."""
+    update_title_rating(instance.title_id, removed=[instance.score])
+    schedule_leaderboard_refresh(instance.title_id)
+
+
+@receiver(post_save, sender=Title)
+def index_title(sender, instance, **kwargs):
+    """Обновляет произведение в поисковом индексе."""
+    index_titles([instance])
+
+
+@receiver(post_save, sender=Title)
+def refresh_title_leaderboards(sender, instance, **kwargs):
+    """Обновляет рейтинги произведения при смене категории."""
+    schedule_leaderboard_refresh(instance.pk)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def refresh_genre_leaderboards(sender, instance, action, reverse, pk_set,
+                               **kwargs):
+    """Обновляет рейтинги жанров при смене жанров произведений."""
+    if reverse and action == 'pre_clear':
+        title_ids = instance.title_set.values_list('pk', flat=True)
+    elif not reverse and action.startswith('post_'):
+        title_ids = [instance.pk]
+    elif reverse and action in ('post_add', 'post_remove'):
+        title_ids = pk_set
+    else:
+        return
+    for title_id in title_ids:
+        schedule_leaderboard_refresh(title_id)
+
+
+@receiver(post_delete, sender=Title)
+def unindex_title(sender, instance, **kwargs):
+    """Удаляет произведение из поискового индекса."""
+    unindex_titles([instance.pk])
+
+
+def touch(queryset):
+    """Сдвигает дату изменения, по которой считаются ETag и Last-Modified."""
+    queryset.update(modified=timezone.now())
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def touch_review(sender, instance, **kwargs):
+    """Сдвигает дату изменения отзыва при изменении его комментариев."""
+    touch(Review.objects.filter(pk=instance.review_id))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_titles_by_genres(sender, instance, action, reverse, pk_set,
+                           **kwargs):
+    """Сдвигает дату изменения произведений при смене их жанров."""
+    if reverse and action == 'pre_clear':
+        touch(Title.objects.filter(genre=instance))
+    elif not reverse and action.startswith('post_'):
+        touch(Title.objects.filter(pk=instance.pk))
+    elif reverse and action in ('post_add', 'post_remove'):
+        touch(Title.objects.filter(pk__in=pk_set))
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def touch_titles_by_category(sender, instance, **kwargs):
+    """Сдвигает дату изменения произведений категории."""
+    touch(Title.objects.filter(category=instance))
+
+
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def touch_titles_by_genre(sender, instance, **kwargs):
+    """Сдвигает дату изменения произведений жанра."""
+    touch(Title.objects.filter(genre=instance))
@@ -42,6 +42,11 @@ class User(AbstractUser):
         choices=ROLE_CHOICES,
         default=USER
     )
+    pending_deletion = models.BooleanField(
+        'Ожидает удаления',
+        default=False,
+        editable=False
+    )
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
 
@@ -1,6 +1,7 @@
 import os
 import sys
 
+import pytest
 from django.utils.version import get_version
 
 root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -34,3 +35,26 @@ assert get_version() < '3.0.0', 'Пожалуйста, используйте в
 pytest_plugins = [
     'tests.fixtures.fixture_user',
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(tmp_path_factory):
+    """Тестовая БД в файле, а не в общей памяти SQLite.
+
+    Так параллельные запросы ждут блокировку записи, как в рабочей БД,
+    а не получают ошибку `database table is locked`.
+    """
+    from django.conf import settings
+
+    settings.DATABASES['default'].setdefault('TEST', {})['NAME'] = str(
+        tmp_path_factory.mktemp('db') / 'test.sqlite3'
+    )
@@ -0,0 +1,43 @@
+import pytest
+from django.core.management import call_command
+
+from .common import create_reviews
+
+
+class Test08TitleRating:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rating_follows_review_changes(self, admin_client, admin):
+        from reviews.models import Review, Title
+
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.reviews_count, title.score_sum) == (3, 12), (
+            'Проверьте, что при создании отзыва обновляются `reviews_count` и `score_sum` произведения'
+        )
+        Review.objects.filter(pk=reviews[0]['id']).get().delete()
+        title.refresh_from_db()
+        assert (title.reviews_count, title.score_sum, title.rating) == (2, 7, 3.5), (
+            'Проверьте, что при удалении отзыва пересчитывается рейтинг произведения'
+        )
+        Review.objects.filter(title=title).delete()
+        title.refresh_from_db()
+        assert (title.reviews_count, title.score_sum, title.rating) == (0, 0, None), (
+            'Проверьте, что у произведения без отзывов `rating` равен `None`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_recount_ratings_command(self, admin_client, admin):
+        from reviews.models import Title
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        Title.objects.update(reviews_count=0, score_sum=0, rating=None)
+        call_command('recount_ratings', chunk_size=1)
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.reviews_count, title.score_sum, title.rating) == (3, 12, 4), (
+            'Проверьте, что команда `recount_ratings` восстанавливает агрегаты отзывов'
+        )
+        title = Title.objects.get(pk=titles[1]['id'])
+        assert (title.reviews_count, title.rating) == (0, None), (
+            'Проверьте, что команда `recount_ratings` обнуляет агрегаты произведений без отзывов'
+        )
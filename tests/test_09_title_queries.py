@@ -0,0 +1,42 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_categories, create_genre
+
+
+class Test09TitleQueries:
+
+    def create_titles(self, admin_client, count):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        for number in range(count):
+            data = {
+                'name': f'Произведение {number}', 'year': 2000,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[number % 2]['slug'],
+            }
+            admin_client.post('/api/v1/titles/', data=data)
+
+    @pytest.mark.parametrize('count', [1, 5, 10])
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_list_queries(self, client, admin_client, count):
+        self.create_titles(admin_client, count)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/')
+        assert len(response.json()['results']) == count
+        assert len(context) == 3, (
+            'Проверьте, что GET запрос `/api/v1/titles/` выполняет постоянное количество запросов к БД '
+            f'независимо от размера страницы, получено {len(context)} для {count} произведений'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_detail_queries(self, client, admin_client):
+        self.create_titles(admin_client, 1)
+        title_id = admin_client.get('/api/v1/titles/').json()['results'][0]['id']
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == 200
+        assert len(context) == 3, (
+            'Проверьте, что GET запрос `/api/v1/titles/{title_id}/` выполняет постоянное количество запросов к БД'
+        )
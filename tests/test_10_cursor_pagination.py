@@ -0,0 +1,58 @@
+import pytest
+
+from .common import create_categories, create_genre, create_reviews
+
+
+class Test10CursorPagination:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_cursor(self, client, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        for number in range(12):
+            data = {'name': f'Произведение {number:02}', 'year': 2000,
+                    'genre': [genres[0]['slug']], 'category': categories[0]['slug']}
+            admin_client.post('/api/v1/titles/', data=data)
+
+        response = client.get('/api/v1/titles/')
+        assert 'count' in response.json(), (
+            'Проверьте, что без параметра `cursor` формат ответа `/api/v1/titles/` не изменился'
+        )
+        response = client.get('/api/v1/titles/?cursor=')
+        assert response.status_code == 200
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что в режиме `cursor` не выполняется подсчёт `count`'
+        )
+        first_page = [title['name'] for title in data['results']]
+        assert first_page == [f'Произведение {number:02}' for number in range(10)]
+        assert data['previous'] is None
+        data = client.get(data['next']).json()
+        assert [title['name'] for title in data['results']] == [
+            'Произведение 10', 'Произведение 11'
+        ], (
+            'Проверьте, что ссылка `next` в режиме `cursor` ведёт на следующую страницу'
+        )
+        assert data['next'] is None
+        data = client.get(data['previous']).json()
+        assert [title['name'] for title in data['results']] == first_page, (
+            'Проверьте, что ссылка `previous` в режиме `cursor` ведёт на предыдущую страницу'
+        )
+        response = client.get('/api/v1/titles/?cursor=broken')
+        assert response.status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_reviews_and_users_cursor(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        data = client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/?cursor=').json()
+        assert [review['id'] for review in data['results']] == [
+            review['id'] for review in reversed(reviews)
+        ], (
+            'Проверьте, что отзывы в режиме `cursor` упорядочены по `-pub_date`, `-id`'
+        )
+        data = admin_client.get('/api/v1/users/?cursor=&limit=2').json()
+        assert len(data['results']) == 2 and data['next'], (
+            'Проверьте, что `/api/v1/users/` поддерживает режим `cursor` с параметром `limit`'
+        )
+        data = admin_client.get(data['next']).json()
+        assert len(data['results']) == 1 and data['next'] is None
@@ -0,0 +1,46 @@
+import pytest
+from django.core.management import call_command
+
+from .common import create_titles
+
+
+class Test11TitleSearch:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_search_titles(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get('/api/v1/titles/?search=драма')
+        assert response.status_code == 200
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [titles[1]['id']], (
+            'Проверьте, что `?search=` ищет по описанию произведения'
+        )
+        data = client.get('/api/v1/titles/?search=пов').json()
+        assert [title['id'] for title in data['results']] == [titles[0]['id']], (
+            'Проверьте, что `?search=` ищет по началу слова в названии'
+        )
+        admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Разворот'})
+        data = client.get('/api/v1/titles/?search=пов').json()
+        assert data['results'] == [], (
+            'Проверьте, что поисковый индекс обновляется при изменении произведения'
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        data = client.get('/api/v1/titles/?search=драма').json()
+        assert data['results'] == [], (
+            'Проверьте, что произведение удаляется из поискового индекса'
+        )
+        data = client.get('/api/v1/titles/?search="*').json()
+        assert data['results'] == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_rebuild_search_index(self, client, admin_client):
+        from django.db import connection
+
+        titles, _, _ = create_titles(admin_client)
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM reviews_title_search')
+        call_command('rebuild_search_index', chunk_size=1)
+        data = client.get('/api/v1/titles/?search=крутое').json()
+        assert [title['id'] for title in data['results']] == [titles[0]['id']], (
+            'Проверьте, что команда `rebuild_search_index` восстанавливает индекс'
+        )
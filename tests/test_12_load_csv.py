@@ -0,0 +1,43 @@
+import csv
+import os
+
+import pytest
+from django.core.management import call_command
+
+from .conftest import MANAGE_PATH
+
+DATA_PATH = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+def count_rows(filename):
+    with open(os.path.join(DATA_PATH, filename), encoding='utf-8', newline='') as csv_file:
+        return sum(1 for _ in csv.reader(csv_file)) - 1
+
+
+class Test12LoadCSV:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_load_csv(self, client):
+        from reviews.models import Comment, Review, Title
+        from users.models import User
+
+        call_command('load_csv', batch_size=7)
+        assert User.objects.count() == count_rows('users.csv')
+        assert Title.objects.count() == count_rows('titles.csv')
+        assert Title.genre.through.objects.count() == count_rows('genre_title.csv'), (
+            'Проверьте, что `load_csv` загружает связи произведений и жанров'
+        )
+        assert Review.objects.count() == count_rows('review.csv')
+        assert Comment.objects.count() == count_rows('comments.csv')
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что `load_csv` сохраняет даты публикации из файла'
+        )
+        title = Title.objects.get(pk=review.title_id)
+        assert title.reviews_count == title.reviews.count(), (
+            'Проверьте, что после загрузки пересчитываются агрегаты отзывов'
+        )
+        data = client.get('/api/v1/titles/?search=шоушенка').json()
+        assert [item['id'] for item in data['results']] == [1], (
+            'Проверьте, что после загрузки перестраивается поисковый индекс'
+        )
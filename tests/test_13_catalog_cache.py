@@ -0,0 +1,82 @@
+import pytest
+
+from .common import auth_client, create_reviews, create_titles
+
+
+class Test13CatalogCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_cache(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get('/api/v1/titles/?year=2000&name=Поворот')
+        assert response['X-Cache'] == 'MISS'
+        response = client.get('/api/v1/titles/?name=Поворот&year=2000')
+        assert response['X-Cache'] == 'HIT', (
+            'Проверьте, что ключ кэша не зависит от порядка параметров запроса'
+        )
+        assert len(response.json()['results']) == 1
+        admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Поворот обратно'})
+        response = client.get('/api/v1/titles/?name=Поворот&year=2000')
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что кэш произведений сбрасывается при изменении произведения'
+        )
+        assert response.json()['results'][0]['name'] == 'Поворот обратно'
+
+        client.get('/api/v1/categories/')
+        admin_client.post('/api/v1/genres/', data={'name': 'Мюзикл', 'slug': 'musical'})
+        assert client.get('/api/v1/categories/')['X-Cache'] == 'HIT', (
+            'Проверьте, что изменение жанра не сбрасывает кэш категорий'
+        )
+        assert client.get('/api/v1/titles/?name=Поворот&year=2000')['X-Cache'] == 'MISS', (
+            'Проверьте, что изменение жанра сбрасывает кэш произведений'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_review_invalidates_rating(self, client, admin_client, admin, user):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[1]["id"]}/'
+        assert client.get(url).json()['rating'] is None
+        assert client.get(url)['X-Cache'] == 'HIT'
+        auth_client(admin).post(f'{url}reviews/', data={'text': 'Неплохо', 'score': 8})
+        assert client.get(url).json()['rating'] == 8, (
+            'Проверьте, что кэш произведений сбрасывается при изменении отзывов'
+        )
+        response = admin_client.get('/api/v1/cache/stats/')
+        assert response.status_code == 200
+        assert response.json()['hits'] >= 1 and response.json()['misses'] >= 2
+        assert auth_client(user).get('/api/v1/cache/stats/').status_code == 403
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_invalidates_after_commit(self, admin_client):
+        from django.db import transaction
+
+        from api.cache import get_version
+        from reviews.models import Category, Title
+
+        titles, _, _ = create_titles(admin_client)
+        with transaction.atomic():
+            Category.objects.create(name='Сериалы', slug='series')
+            Title.objects.get(pk=titles[0]['id']).genre.clear()
+            categories, titles_version = get_version('categories'), get_version('titles')
+        assert get_version('categories') != categories and get_version('titles') != titles_version, (
+            'Проверьте, что кэш каталога сбрасывается ещё раз после коммита записи'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_evicted_version(self, client, admin_client):
+        from api.cache import get_cache, version_key
+
+        create_titles(admin_client)
+        get_cache().delete(version_key('titles'))
+        assert client.get('/api/v1/titles/').json()['count'] == 2
+        assert client.get('/api/v1/titles/')['X-Cache'] == 'HIT'
+        admin_client.post('/api/v1/categories/', data={'name': 'Сериалы', 'slug': 'series'})
+        data = {'name': 'Новое', 'year': 2021, 'genre': ['drama'], 'category': 'series'}
+        assert admin_client.post('/api/v1/titles/', data=data).status_code == 201
+        assert client.get('/api/v1/titles/')['X-Cache'] == 'MISS'
+        get_cache().delete(version_key('titles'))
+        response = client.get('/api/v1/titles/')
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что после вытеснения ключа версии не возвращаются старые записи кэша'
+        )
+        assert response.json()['count'] == 3
@@ -0,0 +1,59 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_comments
+
+
+class Test14ConditionalGet:
+
+    def assert_conditional(self, client, url, name):
+        response = client.get(url)
+        assert response.status_code == 200
+        etag = response.get('ETag')
+        assert etag and response.get('Last-Modified'), (
+            f'Проверьте, что GET запрос `{name}` возвращает заголовки `ETag` и `Last-Modified`'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            f'Проверьте, что GET запрос `{name}` с актуальным `If-None-Match` возвращает статус 304'
+        )
+        assert len(context) == 1
+        return etag
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_and_reviews(self, client, admin_client, admin):
+        comments, reviews, titles, user, _ = create_comments(admin_client, admin)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        reviews_url = f'{title_url}reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        title_etag = self.assert_conditional(client, title_url, '/api/v1/titles/{title_id}/')
+        reviews_etag = self.assert_conditional(client, reviews_url, '/api/v1/titles/{title_id}/reviews/')
+        comments_etag = self.assert_conditional(
+            client, comments_url, '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        )
+        self.assert_conditional(client, f'{comments_url}{comments[0]["id"]}/', 'комментария')
+
+        auth_client(user).patch(f'{reviews_url}{reviews[1]["id"]}/', data={'text': 'Новый текст'})
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=reviews_etag)
+        assert response.status_code == 200 and response['ETag'] != reviews_etag, (
+            'Проверьте, что изменение отзыва меняет `ETag` списка отзывов'
+        )
+        response = client.get(title_url, HTTP_IF_NONE_MATCH=title_etag)
+        assert response.status_code == 200
+
+        auth_client(user).post(comments_url, data={'text': 'Ещё комментарий'})
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=comments_etag)
+        assert response.status_code == 200, (
+            'Проверьте, что новый комментарий меняет `ETag` списка комментариев'
+        )
+
+        title_etag = client.get(title_url)['ETag']
+        admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={'genre': ['drama']})
+        response = client.get(title_url, HTTP_IF_NONE_MATCH=title_etag)
+        assert response.status_code == 200 and response.json()['genre'] == [
+            {'name': 'Драма', 'slug': 'drama'}
+        ], (
+            'Проверьте, что изменение жанров меняет `ETag` произведения'
+        )
@@ -0,0 +1,33 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles
+
+
+class Test15TitleFacets:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_facets(self, client, admin_client):
+        create_titles(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/facets/')
+        assert response.status_code == 200, (
+            'Проверьте, что `/api/v1/titles/facets/` доступен без авторизации'
+        )
+        assert len(context) == 1, (
+            'Проверьте, что фасеты считаются одним запросом к БД'
+        )
+        assert response.json() == {
+            'genre': {'horror': 1, 'comedy': 1, 'drama': 1},
+            'category': {'films': 1, 'books': 1},
+            'year': {'2000': 1, '2020': 1},
+        }
+        data = client.get('/api/v1/titles/facets/?category=films').json()
+        assert data == {
+            'genre': {'horror': 1, 'comedy': 1},
+            'category': {'films': 1},
+            'year': {'2000': 1},
+        }, (
+            'Проверьте, что фасеты учитывают текущие фильтры'
+        )
@@ -0,0 +1,70 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_reviews
+
+
+class Test16SparseFieldsets:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_fields(self, client, admin_client, admin):
+        create_reviews(admin_client, admin)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/?fields=id,name,rating')
+        assert response.status_code == 200
+        for title in response.json()['results']:
+            assert list(title) == ['id', 'name', 'rating'], (
+                'Проверьте, что `?fields=` оставляет в ответе только запрошенные поля'
+            )
+        assert len(context) == 2, (
+            'Проверьте, что при `?fields=` без `genre` не выполняется prefetch жанров'
+        )
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert 'description' not in sql and 'reviews_category' not in sql, (
+            'Проверьте, что при `?fields=` ненужные столбцы не загружаются из БД'
+        )
+        data = client.get('/api/v1/titles/?omit=description,genre').json()
+        assert list(data['results'][0]) == ['id', 'name', 'year', 'rating', 'category'], (
+            'Проверьте, что `?omit=` исключает поля из ответа'
+        )
+        assert data['results'][0]['category'] is not None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_reviews_and_users_fields(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/?fields=id,score')
+        assert [list(review) for review in response.json()['results']] == [['id', 'score']] * 3
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert '"text"' not in sql, (
+            'Проверьте, что при `?fields=` текст отзыва не загружается из БД'
+        )
+        data = admin_client.get('/api/v1/users/?fields=username,role').json()
+        assert list(data['results'][0]) == ['username', 'role']
+        response = admin_client.post('/api/v1/users/?fields=username', data={
+            'username': 'NewUser', 'email': 'newuser@yamdb.fake'
+        })
+        assert response.status_code == 201 and 'email' in response.json(), (
+            'Проверьте, что `?fields=` не влияет на запросы на изменение'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_category_fields(self, client, admin_client, admin, settings):
+        from django.core.cache import cache
+
+        settings.FAST_READ_SERIALIZERS = False
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        ids = ','.join(str(title['id']) for title in titles)
+        for url in (f'/api/v1/titles/batch/?ids={ids}&fields=', '/api/v1/titles/?fields='):
+            counts = []
+            for fields in ('id', 'id,category'):
+                cache.clear()
+                with CaptureQueriesContext(connection) as context:
+                    response = client.get(f'{url}{fields}')
+                assert response.status_code == 200
+                counts.append(len(context))
+            assert counts[0] == counts[1], (
+                f'Проверьте, что `{url}id,category` не загружает категорию отдельным запросом '
+                f'на каждое произведение: {counts}'
+            )
@@ -0,0 +1,32 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles
+
+
+class Test17TitleBatch:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_batch(self, client, admin_client):
+        titles, categories, _ = create_titles(admin_client)
+        ids = [titles[1]['id'], 100500, titles[0]['id'], titles[1]['id']]
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'/api/v1/titles/batch/?ids={",".join(map(str, ids))}')
+        assert response.status_code == 200, (
+            'Проверьте, что `/api/v1/titles/batch/?ids=` доступен без авторизации'
+        )
+        data = response.json()
+        assert [title['id'] for title in data] == [titles[1]['id'], titles[0]['id']], (
+            'Проверьте, что произведения возвращаются в порядке запроса без повторов и отсутствующих id'
+        )
+        assert data[1]['category'] == categories[0] and len(data[1]['genre']) == 2
+        assert len(context) == 2, (
+            'Проверьте, что пакетное получение произведений выполняет постоянное количество запросов'
+        )
+        response = client.get('/api/v1/titles/batch/?ids=1,abc')
+        assert response.status_code == 400
+        response = client.get(f'/api/v1/titles/batch/?ids={",".join(map(str, range(1, 102)))}')
+        assert response.status_code == 400, (
+            'Проверьте, что количество запрашиваемых произведений ограничено'
+        )
@@ -0,0 +1,80 @@
+import pytest
+
+from .common import auth_client, create_reviews
+
+
+class Test18Leaderboards:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_leaderboards(self, client, admin_client, admin, settings):
+        settings.LEADERBOARD_MIN_REVIEWS = 2
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        title_url = f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        admin_client.post(title_url, data={'text': 'Шедевр', 'score': 9})
+        response = client.get('/api/v1/leaderboards/')
+        assert response.status_code == 200, (
+            'Проверьте, что `/api/v1/leaderboards/` доступен без авторизации'
+        )
+        assert [title['id'] for title in response.json()] == [titles[0]['id']], (
+            'Проверьте, что в рейтинг попадают только произведения с достаточным числом отзывов'
+        )
+        auth_client(user).post(title_url, data={'text': 'Отлично', 'score': 7})
+        data = client.get('/api/v1/leaderboards/').json()
+        assert [title['id'] for title in data] == [titles[1]['id'], titles[0]['id']], (
+            'Проверьте, что рейтинг обновляется при добавлении отзывов и упорядочен по `rating`'
+        )
+        assert data[0]['rating'] == 8
+        data = client.get('/api/v1/leaderboards/categories/books/').json()
+        assert [title['id'] for title in data] == [titles[1]['id']]
+        data = client.get('/api/v1/leaderboards/genres/horror/').json()
+        assert [title['id'] for title in data] == [titles[0]['id']]
+        data = client.get('/api/v1/leaderboards/?limit=1').json()
+        assert len(data) == 1
+        assert client.get('/api/v1/leaderboards/genres/unknown/').status_code == 404
+
+        admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={'genre': ['drama']})
+        data = client.get('/api/v1/leaderboards/genres/horror/').json()
+        assert data == [], (
+            'Проверьте, что рейтинг жанра обновляется при смене жанров произведения'
+        )
+        data = client.get('/api/v1/leaderboards/genres/drama/').json()
+        assert [title['id'] for title in data] == [titles[1]['id'], titles[0]['id']]
+
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        data = client.get('/api/v1/leaderboards/').json()
+        assert [title['id'] for title in data] == [titles[0]['id']], (
+            'Проверьте, что удалённое произведение исчезает из рейтинга'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_refresh_consistency(self, admin_client, admin, monkeypatch, settings):
+        from django.db import IntegrityError, transaction
+
+        import reviews.leaderboards
+        from reviews.leaderboards import refresh_leaderboards
+        from reviews.models import LeaderboardEntry, Review
+
+        settings.LEADERBOARD_MIN_REVIEWS = 1
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        first, second = titles[0]['id'], titles[1]['id']
+        with pytest.raises(IntegrityError), transaction.atomic():
+            LeaderboardEntry.objects.create(title_id=first, rating=1)
+        refresh_leaderboards([first])
+        assert LeaderboardEntry.objects.filter(title_id=first, category=None, genre=None).count() == 1, (
+            'Проверьте, что произведение занимает одно место в каждом рейтинге'
+        )
+
+        refreshed = []
+        write_leaderboards = reviews.leaderboards.write_leaderboards
+        monkeypatch.setattr(reviews.leaderboards, 'write_leaderboards',
+                            lambda title_ids: refreshed.append(set(title_ids)) or write_leaderboards(title_ids))
+        with pytest.raises(ZeroDivisionError), transaction.atomic():
+            review = Review.objects.filter(title_id=first).first()
+            review.score = 10
+            review.save()
+            1 / 0
+        assert refreshed == []
+        Review.objects.create(title_id=second, author=admin, text='Отзыв', score=6)
+        assert refreshed == [{second}], (
+            'Проверьте, что произведения из откаченной транзакции не обновляются при следующем коммите'
+        )
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles
+
+
+class Test19TitleBulk:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_bulk(self, client, user_client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        items = [
+            {'name': 'Новое', 'year': 1999, 'genre': [genres[0]['slug'], genres[2]['slug']],
+             'category': categories[1]['slug'], 'description': 'Пакет'},
+            {'id': titles[0]['id'], 'year': 2001, 'genre': [genres[2]['slug']]},
+            {'name': 'Без жанра', 'year': 2000},
+            {'name': 'Чужой жанр', 'year': 2000, 'genre': ['unknown']},
+            {'id': 100500, 'name': 'Нет такого'},
+            {'name': 'Ещё новое', 'year': 2010, 'genre': [genres[1]['slug']]},
+        ]
+        response = client.post('/api/v1/titles/bulk/', data=json.dumps(items), content_type='application/json')
+        assert response.status_code == 401
+        response = user_client.post('/api/v1/titles/bulk/', data=json.dumps(items), content_type='application/json')
+        assert response.status_code == 403, (
+            'Проверьте, что пакетное изменение произведений доступно только администратору'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post('/api/v1/titles/bulk/', data=json.dumps(items), content_type='application/json')
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert [result.get('status') for result in results] == [
+            'created', 'updated', None, None, None, 'created'
+        ], 'Проверьте, что результаты возвращаются по элементам в порядке запроса'
+        assert 'genre' in results[2]['errors']
+        assert 'genre' in results[3]['errors']
+        assert 'id' in results[4]['errors']
+        lookups = [query['sql'] for query in context.captured_queries
+                   if query['sql'].startswith('SELECT') and 'reviews_genre' in query['sql']]
+        assert len(lookups) == 1, (
+            'Проверьте, что жанры всех элементов загружаются одним запросом'
+        )
+
+        created = client.get(f'/api/v1/titles/{results[0]["id"]}/').json()
+        assert created['name'] == 'Новое' and created['category'] == categories[1]
+        assert {genre['slug'] for genre in created['genre']} == {genres[0]['slug'], genres[2]['slug']}
+        updated = client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()
+        assert updated['year'] == 2001 and updated['name'] == titles[0]['name']
+        assert updated['category'] == categories[0]
+        assert [genre['slug'] for genre in updated['genre']] == [genres[2]['slug']]
+        assert client.get(f'/api/v1/titles/{results[5]["id"]}/').json()['name'] == 'Ещё новое'
+        assert client.get('/api/v1/titles/').json()['count'] == 4
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_titles_bulk_ndjson(self, client, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        body = '\n'.join(json.dumps({'name': f'Строка {number}', 'year': 2000 + number,
+                                     'genre': [genres[0]['slug']], 'category': categories[0]['slug']})
+                         for number in range(3))
+        response = admin_client.post('/api/v1/titles/bulk/', data=body + '\n',
+                                     content_type='application/x-ndjson')
+        assert response.status_code == 200, 'Проверьте, что пакетная загрузка принимает NDJSON'
+        assert [result['status'] for result in response.json()['results']] == ['created'] * 3
+        response = client.get('/api/v1/titles/?search=Строка')
+        assert response.json()['count'] == 3
+        response = admin_client.post('/api/v1/titles/bulk/', data='{"name": ',
+                                     content_type='application/x-ndjson')
+        assert response.status_code == 400
+        response = admin_client.post('/api/v1/titles/bulk/', data={'name': 'Один'},
+                                     content_type='application/json')
+        assert response.status_code == 400
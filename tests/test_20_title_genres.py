@@ -0,0 +1,69 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles
+
+
+def link_writes(context):
+    return [query['sql'] for query in context.captured_queries
+            if 'reviews_title_genre' in query['sql']
+            and query['sql'].startswith(('INSERT', 'DELETE'))]
+
+
+class Test20TitleGenres:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_partial_update_genre_diff(self, client, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.patch(url, data={'genre': [genres[1]['slug'], genres[0]['slug']]})
+        assert response.status_code == 200
+        assert link_writes(context) == [], (
+            'Проверьте, что PATCH с теми же жанрами не перезаписывает связи произведения'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.patch(url, data={'genre': [genres[1]['slug'], genres[2]['slug']]})
+        assert response.status_code == 200
+        assert sorted(response.json()['genre']) == sorted([genres[1]['slug'], genres[2]['slug']])
+        writes = link_writes(context)
+        assert len(writes) == 2 and writes[0].startswith('DELETE') and writes[1].startswith('INSERT'), (
+            'Проверьте, что PATCH жанров удаляет и добавляет только изменившиеся связи'
+        )
+        title = client.get(url).json()
+        assert sorted(genre['slug'] for genre in title['genre']) == sorted([genres[1]['slug'], genres[2]['slug']])
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_retag_titles(self, client, user_client, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        ids = [titles[0]['id'], titles[1]['id']]
+        data = {'ids': ids, 'add': [genres[2]['slug']], 'remove': [genres[0]['slug']]}
+        response = user_client.post('/api/v1/titles/genres/', data=json.dumps(data),
+                                    content_type='application/json')
+        assert response.status_code == 403
+        assert client.get(f'/api/v1/titles/?genre={genres[0]["slug"]}').json()['count'] == 1
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post('/api/v1/titles/genres/', data=json.dumps(data),
+                                         content_type='application/json')
+        assert response.status_code == 200
+        assert response.json() == {'added': 1, 'removed': 1}, (
+            'Проверьте, что меняются только отсутствующие и существующие связи'
+        )
+        assert len(link_writes(context)) == 2
+        first = client.get(f'/api/v1/titles/{ids[0]}/').json()
+        assert sorted(genre['slug'] for genre in first['genre']) == sorted([genres[1]['slug'], genres[2]['slug']])
+        second = client.get(f'/api/v1/titles/{ids[1]}/').json()
+        assert [genre['slug'] for genre in second['genre']] == [genres[2]['slug']]
+        response = client.get(f'/api/v1/titles/?genre={genres[0]["slug"]}')
+        assert response.json()['count'] == 0, 'Проверьте, что кэш списка произведений сбрасывается'
+
+        for data in ({'ids': ids, 'add': ['unknown']},
+                     {'ids': [100500], 'add': [genres[0]['slug']]},
+                     {'ids': ids},
+                     {'ids': ids, 'add': [genres[0]['slug']], 'remove': [genres[0]['slug']]}):
+            response = admin_client.post('/api/v1/titles/genres/', data=json.dumps(data),
+                                         content_type='application/json')
+            assert response.status_code == 400, data
@@ -0,0 +1,126 @@
+import sqlite3
+
+import pytest
+from django.db import connections
+
+from .common import auth_client, create_titles
+
+
+@pytest.fixture
+def replica(tmp_path, settings):
+    """Вторая БД SQLite — снимок основной на момент вызова snapshot()."""
+    path = str(tmp_path / 'replica.sqlite3')
+    connections.databases['replica'] = dict(
+        connections.databases['default'], NAME=path, TEST={}
+    )
+    settings.READ_REPLICAS = ['replica']
+
+    def snapshot():
+        connections['replica'].close()
+        connections['default'].ensure_connection()
+        target = sqlite3.connect(path)
+        connections['default'].connection.backup(target)
+        target.close()
+
+    yield snapshot
+    connections['replica'].close()
+    del connections.databases['replica']
+    if hasattr(connections._connections, 'replica'):
+        delattr(connections._connections, 'replica')
+
+
+class Test21ReadReplicas:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reads_from_replica(self, client, admin_client, user, replica):
+        titles, categories, genres = create_titles(admin_client)
+        replica()
+        data = {'name': 'После снимка', 'year': 2021, 'genre': [genres[0]['slug']],
+                'category': categories[0]['slug']}
+        response = admin_client.post('/api/v1/titles/', data=data)
+        assert response.status_code == 201
+        title_id = response.json()['id']
+
+        response = client.get('/api/v1/titles/')
+        assert response.json()['count'] == len(titles), (
+            'Проверьте, что GET-запросы к произведениям читают из реплики'
+        )
+        assert client.get(f'/api/v1/titles/{title_id}/').status_code == 404
+        assert client.get('/api/v1/genres/').json()['count'] == len(genres)
+
+        response = admin_client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == 200, (
+            'Проверьте, что после записи пользователь читает из основной БД'
+        )
+        assert admin_client.get('/api/v1/titles/?name=После').json()['count'] == 1
+
+        user_client = auth_client(user)
+        response = user_client.post(f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+                                    data={'text': 'Отзыв', 'score': 7})
+        assert response.status_code == 201, (
+            'Проверьте, что запись идёт в основную БД при включённых репликах'
+        )
+        response = user_client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/')
+        assert response.json()['count'] == 1
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/')
+        assert response.json()['count'] == 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_sticky_window(self, client, admin_client, replica, settings):
+        settings.REPLICA_STICKY_SECONDS = 0
+        create_titles(admin_client)
+        replica()
+        admin_client.post('/api/v1/genres/', data={'name': 'Новый', 'slug': 'new'})
+        response = admin_client.get('/api/v1/genres/?search=Новый')
+        assert response.json()['count'] == 0, (
+            'Проверьте, что окно чтения из основной БД задаётся REPLICA_STICKY_SECONDS'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_sticky_cookie(self, admin_client, admin, replica):
+        from django.core.cache import cache
+
+        create_titles(admin_client)
+        replica()
+        response = admin_client.post('/api/v1/genres/', data={'name': 'Новый', 'slug': 'new'})
+        assert 'replica_sticky' in response.cookies, (
+            'Проверьте, что ответ на запись ставит cookie окна чтения из основной БД'
+        )
+        cache.clear()
+        assert admin_client.get('/api/v1/genres/?search=Новый').json()['count'] == 1, (
+            'Проверьте, что окно чтения из основной БД не зависит от кэша процесса'
+        )
+        other_client = auth_client(admin)
+        assert other_client.get('/api/v1/genres/?search=Нов').json()['count'] == 0
+        other_client.cookies['replica_sticky'] = f'{admin.pk}:forged:signature'
+        assert other_client.get('/api/v1/genres/?search=Но').json()['count'] == 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_sticky_with_cache(self, client, admin_client, replica):
+        titles, categories, genres = create_titles(admin_client)
+        replica()
+        data = {'name': 'После снимка', 'year': 2021, 'genre': [genres[0]['slug']],
+                'category': categories[0]['slug']}
+        assert admin_client.post('/api/v1/titles/', data=data).status_code == 201
+        assert client.get('/api/v1/titles/').json()['count'] == len(titles)
+        assert client.get('/api/v1/titles/')['X-Cache'] == 'HIT'
+
+        response = admin_client.get('/api/v1/titles/')
+        assert response.json()['count'] == len(titles) + 1, (
+            'Проверьте, что после записи пользователь не получает из кэша ответ реплики'
+        )
+        assert response.get('X-Cache') != 'HIT'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_slug_cache_from_primary(self, client, admin_client, replica):
+        from api.slugs import genre_slugs
+
+        titles, categories, _ = create_titles(admin_client)
+        replica()
+        admin_client.post('/api/v1/genres/', data={'name': 'Новый', 'slug': 'newg'})
+        assert client.get('/api/v1/titles/').json()['count'] == len(titles)
+        assert 'newg' in genre_slugs.by_slug(), (
+            'Проверьте, что кэш slug заполняется из основной БД, а не из реплики'
+        )
+        data = {'name': 'Новое', 'year': 2021, 'genre': ['newg'], 'category': categories[0]['slug']}
+        assert admin_client.post('/api/v1/titles/', data=data).status_code == 201
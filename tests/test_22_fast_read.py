@@ -0,0 +1,56 @@
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from .common import create_comments
+
+URLS = (
+    '/api/v1/titles/',
+    '/api/v1/titles/?fields=name,genre,rating',
+    '/api/v1/titles/?omit=genre,description&cursor=',
+    '/api/v1/titles/?genre={genre}',
+    '/api/v1/titles/{title}/',
+    '/api/v1/titles/{untitled}/',
+    '/api/v1/titles/{title}/reviews/',
+    '/api/v1/titles/{title}/reviews/?cursor=',
+    '/api/v1/titles/{title}/reviews/?fields=author,pub_date',
+    '/api/v1/titles/{title}/reviews/{review}/',
+    '/api/v1/titles/{title}/reviews/{review}/comments/',
+    '/api/v1/titles/{title}/reviews/{review}/comments/?omit=text',
+    '/api/v1/titles/{title}/reviews/{review}/comments/{comment}/',
+)
+
+
+class Test22FastRead:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_same_bytes(self, client, admin_client, admin, settings):
+        from reviews.models import Title
+
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        untitled = Title.objects.create(name='Без категории', year=1990)
+        admin_client.post(f'/api/v1/titles/{titles[1]["id"]}/reviews/', data={'text': 'Ещё', 'score': 8})
+        genre = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()['genre'][0]['slug']
+        params = {'title': titles[0]['id'], 'untitled': untitled.id, 'review': reviews[0]['id'],
+                  'comment': comments[0]['id'], 'genre': genre}
+        for url in URLS:
+            url = url.format(**params)
+            settings.FAST_READ_SERIALIZERS = True
+            cache.clear()
+            fast = client.get(url)
+            settings.FAST_READ_SERIALIZERS = False
+            cache.clear()
+            drf = client.get(url)
+            assert fast.status_code == drf.status_code == 200, url
+            assert fast.content == drf.content, (
+                f'Проверьте, что ответ `{url}` из .values() совпадает с ответом сериализатора'
+            )
+        assert client.get('/api/v1/titles/100500/').status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_benchmark(self, admin_client, admin, capsys):
+        create_comments(admin_client, admin)
+        call_command('benchmark_serializers', '--repeat', '2')
+        output = capsys.readouterr()
+        assert 'ответы различаются' not in output.err
+        assert 'titles: 2 объектов' in output.out
@@ -0,0 +1,79 @@
+import csv
+import io
+import json
+import os
+
+import pytest
+from django.core.management import call_command
+
+from .conftest import MANAGE_PATH
+
+DATA_PATH = os.path.join(MANAGE_PATH, 'static', 'data')
+DATASETS = ('users', 'category', 'genre', 'titles', 'genre_title', 'review', 'comments')
+
+
+def read_static(dataset):
+    with open(os.path.join(DATA_PATH, f'{dataset}.csv'), encoding='utf-8', newline='') as csv_file:
+        return list(csv.reader(csv_file))
+
+
+def export(client, dataset, fmt):
+    response = client.get(f'/api/v1/export/{dataset}.{fmt}')
+    assert response.status_code == 200, (
+        f'Проверьте, что `/api/v1/export/{dataset}.{fmt}` доступен администратору'
+    )
+    assert response.streaming, 'Проверьте, что выгрузка отдаётся через StreamingHttpResponse'
+    return b''.join(response.streaming_content).decode('utf-8')
+
+
+class Test23Export:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_export_access(self, client, user_client, admin_client):
+        assert client.get('/api/v1/export/titles.csv').status_code == 401
+        assert user_client.get('/api/v1/export/titles.csv').status_code == 403
+        assert admin_client.get('/api/v1/export/unknown.csv').status_code == 404
+        assert admin_client.get('/api/v1/export/titles.xml').status_code == 404
+        response = admin_client.get('/api/v1/export/titles.csv', HTTP_ACCEPT='text/csv')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/csv')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_export_csv_roundtrip(self, admin_client, tmp_path):
+        from reviews.models import Comment, Review, Title
+
+        call_command('load_csv')
+        dumps = {dataset: export(admin_client, dataset, 'csv') for dataset in DATASETS}
+        for dataset in DATASETS:
+            rows = list(csv.reader(io.StringIO(dumps[dataset])))
+            static = read_static(dataset)
+            assert rows[0] == static[0], (
+                f'Проверьте, что столбцы `{dataset}.csv` совпадают с static/data'
+            )
+            if dataset in ('category', 'genre', 'titles', 'genre_title'):
+                assert rows == static
+            (tmp_path / f'{dataset}.csv').write_text(dumps[dataset], encoding='utf-8')
+        review = Review.objects.get(pk=1)
+
+        call_command('flush', interactive=False)
+        call_command('load_csv', path=str(tmp_path))
+        assert Title.genre.through.objects.count() == len(read_static('genre_title')) - 1
+        assert Review.objects.get(pk=1).pub_date == review.pub_date, (
+            'Проверьте, что выгрузка CSV загружается обратно командой load_csv'
+        )
+        assert Comment.objects.count() == len(read_static('comments')) - 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_export_ndjson(self, admin_client):
+        from reviews.models import Review
+
+        call_command('load_csv')
+        titles = [json.loads(line) for line in export(admin_client, 'titles', 'ndjson').splitlines()]
+        assert len(titles) == len(read_static('titles')) - 1
+        title = titles[0]
+        assert title['id'] == 1 and title['genre'] and title['category'] == {'name': 'Фильм', 'slug': 'movie'}
+        assert title['rating'] is not None, 'Проверьте, что выгрузка произведений содержит рейтинг'
+        reviews = [json.loads(line) for line in export(admin_client, 'review', 'ndjson').splitlines()]
+        assert len(reviews) == Review.objects.count()
+        assert set(reviews[0]) == {'id', 'title_id', 'text', 'author', 'score', 'pub_date'}
+        assert reviews[0]['pub_date'].startswith('2019-09-24T21:08:21.567')
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from rest_framework.renderers import JSONRenderer
+
+from .common import create_reviews
+
+
+class Test24Renderers:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_orjson_same_output(self, client, admin_client, admin, monkeypatch):
+        from api import renderers
+        from rest_framework.exceptions import ErrorDetail
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/json'
+        data = {**response.data, 'line': 'a\u2028b\u2029', 'error': ErrorDetail('Ошибка')}
+        expected = JSONRenderer().render(data)
+        assert renderers.ORJSONRenderer().render(data) == expected, (
+            'Проверьте, что ORJSONRenderer выводит то же, что JSONRenderer'
+        )
+        reviews = client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/').data
+        assert renderers.ORJSONRenderer().render(reviews) == JSONRenderer().render(reviews)
+        monkeypatch.setattr(renderers, 'orjson', None)
+        assert renderers.ORJSONRenderer().render(data) == expected, (
+            'Проверьте, что без orjson используется стандартный JSONRenderer'
+        )
+        response = client.get('/api/v1/titles/', HTTP_ACCEPT='application/json; indent=2')
+        assert response.content.startswith(b'{\n  "count"')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_orjson_parser(self, admin_client, monkeypatch):
+        from api import parsers
+
+        data = {'name': 'Жанр', 'slug': 'janr'}
+        response = admin_client.post('/api/v1/genres/', data=json.dumps(data), content_type='application/json')
+        assert response.status_code == 201
+        response = admin_client.post('/api/v1/genres/', data='{"name": ', content_type='application/json')
+        assert response.status_code == 400
+        monkeypatch.setattr(parsers, 'orjson', None)
+        data = {'name': 'Другой', 'slug': 'drugoi'}
+        response = admin_client.post('/api/v1/genres/', data=json.dumps(data), content_type='application/json')
+        assert response.status_code == 201
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_msgpack(self, client, admin_client, admin):
+        from api import renderers
+
+        create_reviews(admin_client, admin)
+        response = client.get('/api/v1/titles/', HTTP_ACCEPT='application/msgpack')
+        if renderers.msgpack is None:
+            assert response.status_code == 406, (
+                'Проверьте, что без msgpack формат MessagePack не предлагается'
+            )
+            return
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/msgpack'
+        assert renderers.msgpack.unpackb(response.content, raw=False)['count'] == 2
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_benchmark(self, admin_client, admin, capsys):
+        create_reviews(admin_client, admin)
+        call_command('benchmark_renderers', '--repeat', '2')
+        output = capsys.readouterr()
+        assert 'различаются' not in output.err
+        assert 'orjson: 2 произведений' in output.out
@@ -0,0 +1,128 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_categories, create_genre, create_titles
+
+
+def catalog_queries(context):
+    """Запросы, читающие категории или жанры по slug или целиком."""
+    return [query['sql'] for query in context.captured_queries
+            if query['sql'].startswith(('SELECT "reviews_category"', 'SELECT "reviews_genre"'))
+            and 'INNER JOIN "reviews_title_genre"' not in query['sql']]
+
+
+class Test25SlugCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_write_uses_cache(self, client, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = {'name': 'Первое', 'year': 2000, 'genre': [genres[0]['slug']], 'category': categories[0]['slug']}
+        assert admin_client.post('/api/v1/titles/', data=data).status_code == 201
+        data = {'name': 'Второе', 'year': 2001, 'genre': [genres[0]['slug'], genres[1]['slug']],
+                'category': categories[1]['slug']}
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post('/api/v1/titles/', data=data)
+        assert response.status_code == 201
+        assert response.json()['category'] == categories[1]['slug']
+        assert catalog_queries(context) == [], (
+            'Проверьте, что категории и жанры при записи произведения берутся из кэша slug'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/')
+        assert catalog_queries(context) == [], (
+            'Проверьте, что список произведений берёт категории и жанры из кэша slug'
+        )
+        title = response.json()['results'][0]
+        assert title['category'] == categories[1]
+        assert title['genre'] == sorted(genres[:2], key=lambda genre: genre['name'])
+
+        data['category'] = 'unknown'
+        response = admin_client.post('/api/v1/titles/', data=data)
+        assert response.status_code == 400 and 'category' in response.json()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_invalidation(self, client, admin_client):
+        from api.slugs import SlugCache, category_slugs
+        from reviews.models import Category
+
+        categories = create_categories(admin_client)
+        genres = create_genre(admin_client)
+        other_worker = SlugCache(Category, category_slugs.namespace)
+        assert set(other_worker.by_slug()) == {category['slug'] for category in categories}
+
+        category = Category.objects.get(slug=categories[0]['slug'])
+        category.name = 'Переименована'
+        category.save()
+        assert other_worker.by_slug()[category.slug].name == 'Переименована', (
+            'Проверьте, что кэш slug в других процессах сбрасывается общей версией'
+        )
+        data = {'name': 'Произведение', 'year': 2000, 'genre': [genres[0]['slug']], 'category': category.slug}
+        assert admin_client.post('/api/v1/titles/', data=data).status_code == 201
+        title = client.get('/api/v1/titles/').json()['results'][0]
+        assert title['category'] == {'name': 'Переименована', 'slug': category.slug}
+
+        response = admin_client.delete(f'/api/v1/categories/{category.slug}/')
+        assert response.status_code == 204
+        assert category.slug not in other_worker.by_slug()
+        assert client.get('/api/v1/titles/').json()['results'][0]['category'] is None
+        response = admin_client.post('/api/v1/titles/', data=data)
+        assert response.status_code == 400, 'Проверьте, что удалённая категория не берётся из кэша'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_timeout(self, admin_client, monkeypatch, settings):
+        import api.slugs
+        from api.slugs import SlugCache, category_slugs
+        from reviews.models import Category
+
+        categories = create_categories(admin_client)
+        worker = SlugCache(Category, category_slugs.namespace)
+        now = 1000.0
+        monkeypatch.setattr(api.slugs, 'monotonic', lambda: now)
+        assert worker.by_slug()[categories[0]['slug']].name == categories[0]['name']
+
+        # Изменение без сигналов, как запись другого процесса, чья версия
+        # в LocMemCache этому процессу не видна.
+        Category.objects.filter(slug=categories[0]['slug']).update(name='Другой процесс')
+        now += settings.SLUG_CACHE_TIMEOUT - 1
+        assert worker.by_slug()[categories[0]['slug']].name == categories[0]['name']
+        now += 1
+        assert worker.by_slug()[categories[0]['slug']].name == 'Другой процесс', (
+            'Проверьте, что кэш slug перечитывается по истечении SLUG_CACHE_TIMEOUT'
+        )
+
+    @pytest.mark.parametrize('fast', [True, False])
+    @pytest.mark.django_db(transaction=True)
+    def test_04_missing_objects(self, client, admin_client, settings, fast):
+        from api.slugs import category_slugs, genre_slugs
+        from reviews.models import Category, Genre, Title
+
+        settings.FAST_READ_SERIALIZERS = fast
+        titles, _, _ = create_titles(admin_client)
+        category_slugs.by_pk()
+        genre_slugs.by_pk()
+        # Запись другого процесса, чья смена версии этому процессу не видна.
+        Genre.objects.bulk_create([Genre(name='Новый', slug='new')])
+        Category.objects.bulk_create([Category(name='Новая', slug='fresh')])
+        genre = Genre.objects.get(slug='new')
+        category = Category.objects.get(slug='fresh')
+        title = Title.objects.get(pk=titles[0]['id'])
+        Title.genre.through.objects.create(title=title, genre=genre)
+        Title.objects.filter(pk=title.pk).update(category=category)
+
+        response = client.get(f'/api/v1/titles/{title.pk}/')
+        assert response.status_code == 200, (
+            'Проверьте, что неизвестный кэшу slug жанр не ломает список произведений'
+        )
+        assert response.json()['category'] == {'name': 'Новая', 'slug': 'fresh'}, (
+            'Проверьте, что кэш slug перечитывается, если в нём нет категории произведения'
+        )
+        assert {'name': 'Новый', 'slug': 'new'} in response.json()['genre']
+        category_slugs.by_pk()
+        genre_slugs.by_pk()
+        Genre.objects.bulk_create([Genre(name='Новейший', slug='newest')])
+        data = {'name': 'Ещё одно', 'year': 2000, 'genre': ['newest'], 'category': 'fresh'}
+        assert admin_client.post('/api/v1/titles/', data=data).status_code == 201, (
+            'Проверьте, что кэш slug перечитывается, если в нём нет slug из запроса'
+        )
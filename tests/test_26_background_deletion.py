@@ -0,0 +1,114 @@
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_comments
+
+
+def process_deletions():
+    call_command('process_deletions', '--once', '--batch-size', '2')
+
+
+class Test26BackgroundDeletion:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_deletion(self, admin_client, admin, user_client):
+        from reviews.models import Comment, DeletionJob, Review, Title
+
+        _, _, titles, _, _ = create_comments(admin_client, admin)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/?async=true'
+        assert user_client.delete(url).status_code == 403
+        response = admin_client.delete(url)
+        assert response.status_code == 202, (
+            'Проверьте, что DELETE с `?async=true` возвращает 202 и задание удаления'
+        )
+        job = response.json()
+        assert job['target'] == 'title' and job['status'] == 'pending'
+        assert job['remaining'] > 1
+
+        assert admin_client.get(f'/api/v1/titles/{title_id}/').status_code == 404, (
+            'Проверьте, что произведение скрывается сразу после запроса на удаление'
+        )
+        assert admin_client.get(f'/api/v1/titles/{title_id}/reviews/').status_code == 404
+        listed = [title['id'] for title in admin_client.get('/api/v1/titles/').json()['results']]
+        assert title_id not in listed
+        assert Review.objects.filter(title_id=title_id).count() == 3, (
+            'Проверьте, что зависимые записи удаляются фоновым обработчиком, а не в запросе'
+        )
+
+        assert user_client.get('/api/v1/deletions/').status_code == 403
+        progress = admin_client.get(f'/api/v1/deletions/{job["id"]}/').json()
+        assert progress['status'] == 'pending'
+
+        process_deletions()
+        assert not Title.all_objects.filter(pk=title_id).exists()
+        assert not Review.objects.filter(title_id=title_id).exists()
+        assert not Comment.objects.filter(review__title_id=title_id).exists()
+        progress = admin_client.get(f'/api/v1/deletions/{job["id"]}/').json()
+        assert progress['status'] == 'done' and progress['remaining'] == 0
+        assert progress['processed'] == 9, (
+            'Проверьте, что задание считает удалённые комментарии, отзывы, жанры и произведение'
+        )
+        assert DeletionJob.objects.get(pk=job['id']).finished is not None
+
+        response = admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        assert response.status_code == 204, 'Проверьте, что без `?async` удаление остаётся синхронным'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_user_deletion(self, admin_client, admin):
+        from reviews.models import Comment, Review, Title
+
+        _, reviews, titles, user, _ = create_comments(admin_client, admin)
+        response = admin_client.delete(f'/api/v1/users/{user.username}/?async=1')
+        assert response.status_code == 202
+        assert admin_client.get(f'/api/v1/users/{user.username}/').status_code == 404
+        assert auth_client(user).get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что удаляемый пользователь сразу теряет доступ'
+        )
+
+        process_deletions()
+        assert not Review.objects.filter(author=user).exists()
+        assert not Comment.objects.filter(author=user).exists()
+        assert not type(user).objects.filter(pk=user.pk).exists()
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.reviews_count, title.score_sum) == (2, 9), (
+            'Проверьте, что рейтинг пересчитывается после удаления отзывов пользователя'
+        )
+        assert Comment.objects.filter(review_id=reviews[0]['id']).count() == 2
+
+    @pytest.mark.parametrize('fast', [True, False])
+    @pytest.mark.django_db(transaction=True)
+    def test_03_category_deletion(self, admin_client, admin, settings, fast):
+        from reviews.models import Category, Title
+
+        settings.FAST_READ_SERIALIZERS = fast
+        _, _, titles, _, _ = create_comments(admin_client, admin)
+        response = admin_client.delete('/api/v1/categories/films/?async=yes')
+        assert response.status_code == 202
+        slugs = [category['slug'] for category in admin_client.get('/api/v1/categories/').json()['results']]
+        assert 'films' not in slugs, 'Проверьте, что категория скрывается сразу'
+        assert admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()['category'] is None, (
+            'Проверьте, что скрытая категория не выводится в произведении'
+        )
+        listed = admin_client.get('/api/v1/titles/').json()['results']
+        assert all(title['category'] is None or title['category']['slug'] != 'films' for title in listed)
+        assert admin_client.get('/api/v1/titles/?category=films').json()['count'] == 0, (
+            'Проверьте, что по скрытой категории произведения не фильтруются'
+        )
+        facets = admin_client.get('/api/v1/titles/facets/').json()
+        assert facets['category'] == {'books': 1}, (
+            'Проверьте, что скрытая категория не учитывается в фасетах'
+        )
+        data = {'name': 'Новое', 'year': 2001, 'genre': ['drama'], 'category': 'films'}
+        assert admin_client.post('/api/v1/titles/', data=data).status_code == 400, (
+            'Проверьте, что скрытую категорию нельзя назначить произведению'
+        )
+        response = admin_client.post('/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'})
+        assert response.status_code == 400
+
+        process_deletions()
+        assert not Category.all_objects.filter(slug='films').exists()
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert title.category is None, 'Проверьте, что у произведений категории снимается категория'
+        response = admin_client.get(f'/api/v1/titles/{title.pk}/')
+        assert response.json()['category'] is None
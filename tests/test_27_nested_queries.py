@@ -0,0 +1,79 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_comments
+
+
+def parent_selects(context, table):
+    """Запросы одного объекта таблицы по первичному ключу."""
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT') and f'"{table}"."id" = ' in query['sql']
+    ]
+
+
+class Test27NestedQueries:
+
+    def create_page(self, admin_client, admin, django_user_model, count):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        title_id, review_id = titles[1]['id'], reviews[0]['id']
+        for number in range(count):
+            author = django_user_model.objects.create_user(
+                username=f'reader{number}', email=f'reader{number}@yamdb.fake', password='1234567'
+            )
+            client = auth_client(author)
+            client.post(f'/api/v1/titles/{title_id}/reviews/', data={'text': 'Отзыв', 'score': 7})
+            client.post(
+                f'/api/v1/titles/{titles[0]["id"]}/reviews/{review_id}/comments/', data={'text': 'Комментарий'}
+            )
+        return (
+            f'/api/v1/titles/{title_id}/reviews/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{review_id}/comments/',
+        )
+
+    @pytest.mark.parametrize('fast', [True, False])
+    @pytest.mark.parametrize('count', [1, 5])
+    @pytest.mark.django_db(transaction=True)
+    def test_01_list_queries(self, client, admin_client, admin, django_user_model, settings, fast, count):
+        settings.FAST_READ_SERIALIZERS = fast
+        reviews_url, comments_url = self.create_page(admin_client, admin, django_user_model, count)
+        for url, total in ((reviews_url, count), (comments_url, count + 3)):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            assert response.status_code == 200
+            assert len(response.json()['results']) == total
+            assert len(context) == 3, (
+                f'Проверьте, что GET запрос `{url}` выполняет поиск родителя, подсчёт и один запрос '
+                f'страницы вместе с авторами, получено {len(context)} запросов'
+            )
+            assert not [query for query in context.captured_queries if 'FROM "users_user"' in query['sql']], (
+                'Проверьте, что авторы читаются в запросе страницы через select_related'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_create_single_parent_lookup(self, admin_client, admin, user_client):
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        title_id = titles[1]['id']
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(f'/api/v1/titles/{title_id}/reviews/', data={'text': 'Отзыв', 'score': 5})
+        assert response.status_code == 201
+        assert len(parent_selects(context, 'reviews_title')) == 1, (
+            'Проверьте, что при создании отзыва произведение читается один раз'
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == 201
+        assert len(parent_selects(context, 'reviews_review')) == 1, (
+            'Проверьте, что при создании комментария отзыв читается один раз'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_review_belongs_to_title(self, client, admin_client, admin, user_client):
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        assert client.get(url).status_code == 404, (
+            'Проверьте, что комментарии доступны только по адресу произведения, к которому относится отзыв'
+        )
+        assert user_client.post(url, data={'text': 'Комментарий'}).status_code == 404
@@ -0,0 +1,59 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+import pytest
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_titles
+
+PARALLEL_POSTS = 4
+
+
+class Test28ReviewUniqueness:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_duplicate_review(self, admin_client, user, user_client):
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'Отзыв', 'score': 5})
+        assert response.status_code == 201
+        assert not [query for query in context.captured_queries if query['sql'].startswith('SELECT (1)')], (
+            'Проверьте, что перед созданием отзыва не выполняется проверка на повтор'
+        )
+        response = user_client.post(url, data={'text': 'Ещё отзыв', 'score': 2})
+        assert response.status_code == 400, (
+            'Проверьте, что повторный отзыв на произведение возвращает статус 400'
+        )
+        assert response.json() == {'non_field_errors': ['Можно оставить только 1 отзыв на произведение.']}
+        assert Review.objects.filter(author=user).count() == 1
+        response = user_client.post(f'/api/v1/titles/{titles[1]["id"]}/reviews/', data={'text': 'Отзыв', 'score': 5})
+        assert response.status_code == 201
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_parallel_reviews(self, admin_client, user):
+        from reviews.models import Review, Title
+
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        barrier = Barrier(PARALLEL_POSTS)
+
+        def post(score):
+            client = auth_client(user)
+            barrier.wait()
+            try:
+                return client.post(url, data={'text': f'Отзыв {score}', 'score': score}).status_code
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(PARALLEL_POSTS) as executor:
+            statuses = sorted(executor.map(post, range(1, PARALLEL_POSTS + 1)))
+        assert statuses == [201] + [400] * (PARALLEL_POSTS - 1), (
+            'Проверьте, что из параллельных отзывов одного автора создаётся ровно один, '
+            f'а остальные получают 400, получено {statuses}'
+        )
+        assert Review.objects.filter(author=user).count() == 1
+        assert Title.objects.get(pk=titles[0]['id']).reviews_count == 1
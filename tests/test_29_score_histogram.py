@@ -0,0 +1,66 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_reviews
+
+
+def histogram(**counts):
+    result = {str(score): 0 for score in range(1, 11)}
+    result.update({score[1:]: count for score, count in counts.items()})
+    return result
+
+
+class Test29ScoreHistogram:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_scores_endpoint(self, client, admin_client, admin):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/scores/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200, 'Проверьте, что `/api/v1/titles/{title_id}/scores/` доступен всем'
+        assert response.json() == {'reviews_count': 3, 'scores': histogram(s3=1, s4=1, s5=1)}
+        assert len(context) == 1 and 'reviews_review' not in context.captured_queries[0]['sql'], (
+            'Проверьте, что распределение оценок читается из одной строки произведения без отзывов'
+        )
+        assert client.get(f'/api/v1/titles/{titles[1]["id"]}/scores/').json() == {
+            'reviews_count': 0, 'scores': histogram()
+        }
+        assert client.get('/api/v1/titles/999/scores/').status_code == 404
+
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        auth_client(user).patch(f'{reviews_url}{reviews[1]["id"]}/', data={'score': 8})
+        assert client.get(url).json()['scores'] == histogram(s4=1, s5=1, s8=1), (
+            'Проверьте, что распределение оценок обновляется при изменении отзыва'
+        )
+        admin_client.delete(f'{reviews_url}{reviews[0]["id"]}/')
+        assert client.get(url).json() == {'reviews_count': 2, 'scores': histogram(s4=1, s8=1)}, (
+            'Проверьте, что распределение оценок обновляется при удалении отзыва'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_detail_opt_in(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert 'scores' not in client.get(url).json(), (
+            'Проверьте, что распределение оценок добавляется в произведение только по запросу'
+        )
+        response = client.get(f'{url}?scores=true')
+        assert response.json()['scores'] == histogram(s3=1, s4=1, s5=1), (
+            'Проверьте, что `?scores=true` добавляет распределение оценок в произведение'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_recount_matches(self, admin_client, admin):
+        from reviews.models import SCORE_FIELDS, Title
+        from reviews.ratings import recount_ratings
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        fields = list(SCORE_FIELDS.values())
+        stored = Title.objects.values(*fields).get(pk=titles[0]['id'])
+        Title.objects.update(**{name: 0 for name in fields})
+        recount_ratings()
+        assert Title.objects.values(*fields).get(pk=titles[0]['id']) == stored, (
+            'Проверьте, что recount_ratings пересчитывает распределение оценок'
+        )
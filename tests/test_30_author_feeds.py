@@ -0,0 +1,77 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_comments
+
+
+def query_plan(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return ' '.join(row[-1] for row in cursor.fetchall())
+
+
+class Test30AuthorFeeds:
+
+    @pytest.mark.parametrize('fast', [True, False])
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reviews_feed(self, client, admin_client, admin, settings, fast):
+        settings.FAST_READ_SERIALIZERS = fast
+        _, reviews, titles, user, _ = create_comments(admin_client, admin)
+        auth_client(user).post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/', data={'text': 'Второй отзыв', 'score': 9}
+        )
+        url = f'/api/v1/users/{user.username}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200, (
+            'Проверьте, что `/api/v1/users/{username}/reviews/` доступен без токена'
+        )
+        data = response.json()
+        assert data['count'] == 2
+        assert [review['title'] for review in data['results']] == [titles[1]['id'], titles[0]['id']], (
+            'Проверьте, что лента отзывов автора содержит id произведений, новые отзывы сначала'
+        )
+        assert data['results'][1] == {
+            'id': reviews[1]['id'], 'text': reviews[1]['text'], 'author': user.username,
+            'score': reviews[1]['score'], 'pub_date': data['results'][1]['pub_date'], 'title': titles[0]['id'],
+        }
+        assert len(context) == 3, (
+            'Проверьте, что лента выполняет поиск автора, подсчёт и один запрос страницы'
+        )
+        assert client.get('/api/v1/users/nobody/reviews/').status_code == 404
+        assert admin_client.post(url, data={'text': 'Отзыв', 'score': 5}).status_code == 405
+
+        page = client.get(f'{url}?cursor=&limit=1').json()
+        assert [review['title'] for review in page['results']] == [titles[1]['id']]
+        assert client.get(page['next']).json()['results'][0]['title'] == titles[0]['id']
+
+    @pytest.mark.parametrize('fast', [True, False])
+    @pytest.mark.django_db(transaction=True)
+    def test_02_comments_feed(self, client, admin_client, admin, settings, fast):
+        settings.FAST_READ_SERIALIZERS = fast
+        comments, reviews, titles, user, _ = create_comments(admin_client, admin)
+        response = client.get(f'/api/v1/users/{user.username}/comments/')
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert len(results) == 1
+        assert results[0]['id'] == comments[1]['id']
+        assert (results[0]['review'], results[0]['title']) == (reviews[0]['id'], titles[0]['id']), (
+            'Проверьте, что лента комментариев автора содержит id отзыва и произведения'
+        )
+        response = client.get(f'/api/v1/users/{user.username}/comments/?fields=id,title')
+        assert response.json()['results'] == [{'id': comments[1]['id'], 'title': titles[0]['id']}]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_feed_indexes(self, user):
+        from reviews.models import Comment, Review
+
+        plan = query_plan(Review.objects.filter(author=user).order_by('-pub_date', '-id')[:10])
+        assert 'review_author_pub_date_idx' in plan and 'TEMP B-TREE' not in plan, (
+            f'Проверьте, что лента отзывов читается по индексу (author, pub_date): {plan}'
+        )
+        plan = query_plan(Comment.objects.filter(author=user).order_by('-pub_date', '-id')[:10])
+        assert 'comment_author_pub_date_idx' in plan and 'TEMP B-TREE' not in plan, (
+            f'Проверьте, что лента комментариев читается по индексу (author, pub_date): {plan}'
+        )
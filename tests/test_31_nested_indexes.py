@@ -0,0 +1,58 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_comments
+
+
+def page_plans(client, url, table):
+    """Планы запросов страницы, выполненных API при GET url."""
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    plans = []
+    with connection.cursor() as cursor:
+        for query in context.captured_queries:
+            if f'FROM "{table}"' in query['sql'] and 'LIMIT' in query['sql']:
+                cursor.execute(f'EXPLAIN QUERY PLAN {query["sql"]}')
+                plans.append(' | '.join(row[-1] for row in cursor.fetchall()))
+    assert plans, f'Не найден запрос страницы `{url}`'
+    return response, plans
+
+
+class Test31NestedIndexes:
+
+    @pytest.mark.parametrize('fast', [True, False])
+    @pytest.mark.django_db(transaction=True)
+    def test_01_index_ordered_pages(self, client, admin_client, admin, django_user_model, settings, fast):
+        settings.FAST_READ_SERIALIZERS = fast
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        for number in range(9):
+            author = auth_client(django_user_model.objects.create_user(
+                username=f'reader{number}', email=f'reader{number}@yamdb.fake', password='1234567'
+            ))
+            author.post(reviews_url, data={'text': f'Отзыв {number}', 'score': 6})
+            author.post(comments_url, data={'text': f'Комментарий {number}'})
+
+        for url, table, index in (
+            (reviews_url, 'reviews_review', 'review_title_pub_date_idx'),
+            (comments_url, 'reviews_comment', 'comment_review_pub_date_idx'),
+        ):
+            _, plans = page_plans(client, f'{url}?page=2', table)
+            response, cursor_plans = page_plans(client, f'{url}?cursor=', table)
+            _, next_plans = page_plans(client, response.json()['next'], table)
+            for plan in plans + cursor_plans + next_plans:
+                assert index in plan and 'TEMP B-TREE' not in plan, (
+                    f'Проверьте, что страница `{url}` читается в порядке индекса {index}: {plan}'
+                )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_stable_order(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        ids = [comment['id'] for comment in client.get(url).json()['results']]
+        assert ids == sorted((comment['id'] for comment in comments), reverse=True), (
+            'Проверьте, что комментарии одной даты упорядочены по убыванию id'
+        )
@@ -0,0 +1,118 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles, create_users_api
+
+URL = '/api/v1/reviews/import/'
+
+
+def ndjson(items):
+    return '\n'.join(json.dumps(item, ensure_ascii=False) for item in items)
+
+
+def title_updates(context):
+    return [query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('UPDATE "reviews_title"')]
+
+
+class Test32ReviewImport:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_import_reviews(self, client, user_client, admin_client, admin):
+        titles, _, _ = create_titles(admin_client)
+        user, moderator = create_users_api(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        admin_client.post(f'/api/v1/titles/{second}/reviews/', data={'text': 'Уже есть', 'score': 5})
+        items = [
+            {'title_id': first, 'author': user.username, 'text': 'Импорт', 'score': 7,
+             'pub_date': '2020-01-02T03:04:05Z'},
+            {'title_id': first, 'author': admin.username, 'text': 'Много', 'score': 11},
+            {'title_id': first, 'author': user.username, 'text': 'Повтор', 'score': 5},
+            {'title_id': 100500, 'author': moderator.username, 'text': 'Нет произведения', 'score': 5},
+            {'title_id': second, 'author': 'ghost', 'text': 'Нет автора', 'score': 5},
+            {'title_id': second, 'author': moderator.username, 'text': 'Импорт', 'score': 3},
+            {'title_id': first, 'author': moderator.username, 'text': 'Импорт', 'score': 9},
+            {'title_id': second, 'author': admin.username, 'text': 'Конфликт', 'score': 1},
+        ]
+        data = ndjson(items)
+        assert client.post(URL, data=data, content_type='application/x-ndjson').status_code == 401
+        response = user_client.post(URL, data=data, content_type='application/x-ndjson')
+        assert response.status_code == 403, 'Проверьте, что импорт отзывов доступен только администратору'
+
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(URL, data=data, content_type='application/x-ndjson')
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert [result.get('status') for result in results] == [
+            'created', None, 'conflict', None, None, 'created', 'created', 'conflict'
+        ], 'Проверьте, что результаты импорта возвращаются по элементам в порядке запроса'
+        assert 'score' in results[1]['errors'], 'Проверьте, что оценка проверяется по MIN_SCORE и MAX_SCORE'
+        assert 'title_id' in results[3]['errors']
+        assert 'author' in results[4]['errors']
+        assert len(title_updates(context)) == 2, (
+            'Проверьте, что агрегаты обновляются один раз на произведение в конце импорта'
+        )
+
+        review = client.get(f'/api/v1/titles/{first}/reviews/{results[0]["id"]}/').json()
+        assert review['author'] == user.username
+        assert review['pub_date'].startswith('2020-01-02T03:04:05'), (
+            'Проверьте, что импорт сохраняет дату публикации отзыва'
+        )
+        assert client.get(f'/api/v1/titles/{first}/scores/').json()['reviews_count'] == 2
+        title = client.get(f'/api/v1/titles/{first}/').json()
+        assert title['rating'] == 8, 'Проверьте, что импорт обновляет рейтинг произведения'
+        assert client.get(f'/api/v1/titles/{second}/').json()['rating'] == 4
+
+        response = admin_client.post(URL, data=json.dumps({'title_id': first}), content_type='application/json')
+        assert response.status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_batches(self, admin_client, django_user_model):
+        from api.bulk import bulk_import_reviews
+        from reviews.models import Review, Title
+
+        titles, _, _ = create_titles(admin_client)
+        items = []
+        for number in range(5):
+            django_user_model.objects.create_user(
+                username=f'reader{number}', email=f'reader{number}@yamdb.fake', password='1234567'
+            )
+            for title in titles:
+                items.append({'title_id': title['id'], 'author': f'reader{number}', 'text': 'Отзыв', 'score': 6})
+        with CaptureQueriesContext(connection) as context:
+            results = bulk_import_reviews(items, batch_size=4)
+        assert all(result['status'] == 'created' for result in results)
+        inserts = [query for query in context.captured_queries
+                   if query['sql'].startswith('INSERT INTO "reviews_review"')]
+        assert len(inserts) == 3, 'Проверьте, что отзывы вставляются пачками'
+        assert len(title_updates(context)) == len(titles)
+        assert Title.objects.get(pk=titles[0]['id']).reviews_count == 5
+        assert Review.objects.count() == 10
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_conflict_after_check(self, admin_client, admin):
+        from datetime import datetime, timezone
+
+        from api.bulk import insert_reviews
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        admin_client.post(f'/api/v1/titles/{titles[0]["id"]}/reviews/', data={'text': 'Отзыв', 'score': 5})
+        user, _ = create_users_api(admin_client)
+        pub_date = datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        reviews = [
+            Review(title_id=titles[1]['id'], author=admin, text='Новый', score=4, pub_date=pub_date),
+            Review(title_id=titles[0]['id'], author=admin, text='Появился раньше', score=4),
+            Review(title_id=titles[0]['id'], author=user, text='Новый', score=4),
+        ]
+        insert_reviews(reviews)
+        assert [review.pk is not None for review in reviews] == [True, False, True], (
+            'Проверьте, что при нарушении title_author пачка вставляется по одному отзыву'
+        )
+        assert Review.objects.count() == 3
+        assert Review.objects.get(pk=reviews[0].pk).pub_date == pub_date, (
+            'Проверьте, что при повторной вставке по одному отзыву сохраняется дата публикации из импорта'
+        )